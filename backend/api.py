@@ -6,7 +6,7 @@ from fastapi.security import OAuth2PasswordRequestForm, HTTPBearer, HTTPAuthoriz
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.exceptions import RequestValidationError
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Enum, Text, text
+from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Enum, Text, text, exists, select
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from pydantic import BaseModel
@@ -682,8 +682,8 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
 @app.post("/auth/create-admin")
 def create_admin_user(db: Session = Depends(get_db)):
     """Create initial admin user from environment variables (only if no users exist)"""
-    user_count = db.query(User).count()
-    if user_count > 0:
+    # A single EXISTS probe; with no users at all the admin username is free too
+    if db.scalar(select(exists().select_from(User))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Admin user already exists or users are present"
@@ -696,14 +696,6 @@ def create_admin_user(db: Session = Depends(get_db)):
             detail="ADMIN_PASSWORD environment variable is required"
         )
 
-    # Check if admin user already exists by username
-    existing_admin = db.query(User).filter(User.username == ADMIN_USERNAME).first()
-    if existing_admin:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"User with username '{ADMIN_USERNAME}' already exists"
-        )
-
     admin_user = User(
         username=ADMIN_USERNAME,
         email=ADMIN_EMAIL,
@@ -833,6 +825,9 @@ def reset_admin_user(db: Session = Depends(get_db)):
             detail="ADMIN_PASSWORD environment variable is required"
         )
 
+    # bcrypt is deliberately slow; hash once for whichever branch runs
+    hashed_password = get_password_hash(ADMIN_PASSWORD)
+
     # Find existing admin user
     admin_user = db.query(User).filter(User.role == UserRole.ADMIN).first()
 
@@ -841,7 +836,7 @@ def reset_admin_user(db: Session = Depends(get_db)):
         admin_user.username = ADMIN_USERNAME
         admin_user.email = ADMIN_EMAIL
         admin_user.full_name = ADMIN_FULL_NAME
-        admin_user.hashed_password = get_password_hash(ADMIN_PASSWORD)
+        admin_user.hashed_password = hashed_password
         admin_user.is_active = True
 
         db.commit()
@@ -860,7 +855,7 @@ def reset_admin_user(db: Session = Depends(get_db)):
             username=ADMIN_USERNAME,
             email=ADMIN_EMAIL,
             full_name=ADMIN_FULL_NAME,
-            hashed_password=get_password_hash(ADMIN_PASSWORD),
+            hashed_password=hashed_password,
             role=UserRole.ADMIN,
             is_active=True
         )
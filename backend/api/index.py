@@ -1,7 +1,28 @@
 """
 Vercel entry point for FastAPI application
 """
-from app.main import app
+import os
 
-# This is the entry point that Vercel will use
-handler = app
+# The FastAPI app is resolved on first access so importing this module stays
+# cheap; set EAGER_IMPORT=1 (e.g. in CI) to surface import errors right away
+_app = None
+
+_LAZY_NAMES = ("app", "handler")
+
+
+def __getattr__(name):
+    global _app
+    if name in _LAZY_NAMES:
+        if _app is None:
+            from app.main import app as _app
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    # Vercel looks the entry point up by name, so advertise the lazy ones
+    return sorted(list(globals()) + list(_LAZY_NAMES))
+
+
+if os.environ.get("EAGER_IMPORT"):
+    __getattr__("app")
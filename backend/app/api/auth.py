@@ -1,6 +1,7 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
 
 from ..database import get_db
@@ -16,6 +17,7 @@ from ..auth.security import (
     require_admin,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from ..services.user_service import user_service, USER_LIST_COLUMNS
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -61,7 +63,11 @@ def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
     return db_user
 
 @router.post("/login", response_model=Token)
-def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+def login_user(
+    background_tasks: BackgroundTasks,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db)
+):
     """Login user and return access token"""
     user = authenticate_user(db, form_data.username, form_data.password)
     if not user:
@@ -71,9 +77,8 @@ def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Update last login
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Update last login after the response is sent
+    background_tasks.add_task(user_service.update_last_login, user.id)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -87,7 +92,11 @@ def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
     }
 
 @router.post("/login/simple", response_model=Token)
-def login_simple(user_data: UserLogin, db: Session = Depends(get_db)):
+def login_simple(
+    user_data: UserLogin,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Simple login endpoint for JSON requests"""
     user = authenticate_user(db, user_data.username, user_data.password)
     if not user:
@@ -97,10 +106,8 @@ def login_simple(user_data: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Update last login
-    from datetime import datetime
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Update last login after the response is sent
+    background_tasks.add_task(user_service.update_last_login, user.id)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -126,15 +133,16 @@ def list_users(
     current_user: User = Depends(require_admin)
 ):
     """List all users (admin only)"""
-    users = db.query(User).offset(skip).limit(limit).all()
+    users = db.execute(
+        select(*USER_LIST_COLUMNS).offset(skip).limit(limit)
+    ).mappings().all()
     return users
 
 @router.post("/create-admin")
 def create_admin_user(db: Session = Depends(get_db)):
     """Create initial admin user (only if no users exist)"""
-    # Check if any users exist
-    user_count = db.query(User).count()
-    if user_count > 0:
+    # Check if any users exist (stops at the first row instead of counting)
+    if db.scalar(select(exists().select_from(User))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Admin user already exists or users are present"
@@ -4,6 +4,7 @@ API endpoints for advanced search and filtering with authentication
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import asyncio
 import logging
 from datetime import datetime
 
@@ -20,6 +21,33 @@ from ..models.user import User
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Held so the background task is not garbage collected and can be stopped on shutdown
+search_log_flusher: Optional[asyncio.Task] = None
+
+def _log_flusher_exit(task: asyncio.Task):
+    """Report a search log flusher that stopped with an error"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Search log flusher stopped", exc_info=task.exception())
+
+@router.on_event("startup")
+async def start_search_log_flusher():
+    """Write buffered search history in the background"""
+    global search_log_flusher
+    search_log_flusher = asyncio.create_task(search_service.run_search_log_flusher())
+    search_log_flusher.add_done_callback(_log_flusher_exit)
+
+@router.on_event("shutdown")
+async def flush_search_logs():
+    """Stop the background flusher and write any search history still buffered"""
+    if search_log_flusher is not None:
+        search_log_flusher.cancel()
+        try:
+            await search_log_flusher
+        except asyncio.CancelledError:
+            pass
+    while await asyncio.to_thread(search_service.flush_search_logs):
+        pass
+
 @router.get("/search", response_model=SearchResult)
 def full_text_search(
     q: str = Query(..., description="Search query"),
@@ -49,7 +77,8 @@ def advanced_search(
         sort_by=search_request.sort_by,
         sort_order=search_request.sort_order,
         page=search_request.page,
-        page_size=search_request.page_size
+        page_size=search_request.page_size,
+        cursor=search_request.cursor
     )
     logger.info(f"User {current_user.username} performed advanced search - {result.total_count} results")
     return result
@@ -15,6 +15,10 @@ class Settings:
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./contact_db.sqlite")
 
+    # PostgreSQL connection pool; 0 opens a connection per session (NullPool)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "0"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "25"))
+
     # Server
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
@@ -32,6 +36,9 @@ class Settings:
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads/")
 
+    # API docs (/openapi.json, /docs, /redoc); disable for serverless deployments
+    ENABLE_API_DOCS: bool = os.getenv("ENABLE_API_DOCS", "true").lower() == "true"
+
     # OCR
     TESSERACT_PATH: str = os.getenv("TESSERACT_PATH", "/usr/bin/tesseract")
 
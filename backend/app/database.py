@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 from app.config import settings
@@ -7,9 +7,14 @@ engine = None
 
 # Production environment (PostgreSQL - Neon/Render)
 if settings.DATABASE_URL.startswith("postgresql"):
+    # Long-running servers can keep a sized pool; serverless stays on NullPool
+    if settings.DB_POOL_SIZE > 0:
+        pool_options = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
+    else:
+        pool_options = {"poolclass": NullPool}  # For serverless compatibility
     engine = create_engine(
         settings.DATABASE_URL,
-        poolclass=NullPool,  # For serverless compatibility
+        **pool_options,
         pool_pre_ping=True,
         pool_recycle=300,
         connect_args={
@@ -22,6 +27,16 @@ elif settings.DATABASE_URL.startswith("sqlite"):
         settings.DATABASE_URL,
         connect_args={"check_same_thread": False}  # Required for SQLite
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL journaling with NORMAL sync: one fsync per checkpoint, not per commit"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 # Fallback for other database types if needed
 else:
     engine = create_engine(settings.DATABASE_URL)
@@ -1,8 +1,10 @@
 import logging
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import MemoryHandler, RotatingFileHandler
 import os
 
+LOG_BUFFER_CAPACITY = 100
+
 def setup_logging():
     """Configure logging for the application"""
     
@@ -18,11 +20,17 @@ def setup_logging():
         handlers=[
             # Console handler
             logging.StreamHandler(sys.stdout),
-            # File handler with rotation
-            RotatingFileHandler(
-                os.path.join(log_dir, 'app.log'),
-                maxBytes=10*1024*1024,  # 10MB
-                backupCount=5
+            # File handler with rotation, written in batches: records are
+            # buffered and flushed every LOG_BUFFER_CAPACITY entries or as
+            # soon as a warning or error arrives
+            MemoryHandler(
+                capacity=LOG_BUFFER_CAPACITY,
+                flushLevel=logging.WARNING,
+                target=RotatingFileHandler(
+                    os.path.join(log_dir, 'app.log'),
+                    maxBytes=10*1024*1024,  # 10MB
+                    backupCount=5
+                )
             )
         ]
     )
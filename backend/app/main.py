@@ -2,16 +2,17 @@ from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Query
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import insert, inspect
 from typing import List
 import io
+import re
 import csv
 from io import StringIO
 from app.models import Contact, Base
 from app.schemas import ContactCreate, ContactUpdate, ContactOut
 from app.database import SessionLocal, engine
 from app.parsers.parse import parse_pdf, parse_docx, parse_txt, parse_image, parse_vcf
-from app.utils.nlp import categorize_contact
+from app.utils.nlp import categorize_contact, categorize_contacts
 # from app.ml.categorizer import categorize_contact_ml
 # from app.api.categories import router as categories_router
 # from app.api.search import router as search_router
@@ -30,9 +31,13 @@ from app.logging_config import setup_logging
 # Setup logging
 logger = setup_logging()
 
+# Addresses mentioning any of these are treated as the company name
+BUSINESS_ADDRESS_PATTERN = re.compile(r'office|building|tower|complex|center', re.IGNORECASE)
 
 
-app = FastAPI()
+
+# Without an OpenAPI URL no schema or docs routes are registered
+app = FastAPI(openapi_url="/openapi.json" if settings.ENABLE_API_DOCS else None)
 
 # Include routers (temporarily disabled)
 # app.include_router(categories_router, prefix="/api", tags=["categories"])
@@ -82,16 +87,9 @@ def database_info():
         db_type = "MySQL"
 
     try:
-        # Test connection
+        # Test connection; the dialect's inspector lists tables in one query
         with engine.connect() as conn:
-            if db_url.startswith("sqlite"):
-                result = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))
-            elif db_url.startswith("postgresql"):
-                result = conn.execute(text("SELECT tablename FROM pg_tables WHERE schemaname = 'public'"))
-            else:
-                result = conn.execute(text("SELECT 1"))
-
-            tables = [row[0] for row in result] if db_url.startswith(("sqlite", "postgresql")) else ["connection_test"]
+            tables = inspect(conn).get_table_names()
 
             return {
                 "database_type": db_type,
@@ -149,7 +147,7 @@ def create_contact(contact: ContactCreate, db: Session = Depends(get_db)):
     if not contact_data.get('company') and contact_data.get('address'):
         # Try to extract company from address if it looks like a business address
         address = contact_data['address']
-        if any(biz_word in address.lower() for biz_word in ['office', 'building', 'tower', 'complex', 'center']):
+        if BUSINESS_ADDRESS_PATTERN.search(address):
             contact_data['company'] = address
 
     db_contact = Contact(**contact_data)
@@ -305,9 +303,11 @@ def upload_file(file: UploadFile = File(...), db: Session = Depends(get_db)):
     except Exception as e:
         raise FileProcessingError(file.filename, str(e))
 
-    for c in contacts:
-        c["category"] = categorize_contact(c)
-        db.add(Contact(**c))
+    for c, category in zip(contacts, categorize_contacts(contacts)):
+        c["category"] = category
+    if contacts:
+        # One batched INSERT for the whole file instead of one per contact
+        db.execute(insert(Contact), contacts)
     db.commit()
 
     return {"message": f"{len(contacts)} contacts imported successfully"}
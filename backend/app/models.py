@@ -1,9 +1,23 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, DDL, event, func, literal_column
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.declarative import declarative_base
 import datetime
 
 Base = declarative_base()
 
+# Fields covered by term search through the combined search_blob
+SEARCH_BLOB_COLUMNS = ("name", "email", "phone", "address", "category", "notes")
+
+def search_blob_expression(columns):
+    """
+    Lowercased, space-separated concatenation of the given column expressions;
+    SQLAlchemy renders the concatenation per dialect (|| or concat())
+    """
+    blob = func.coalesce(columns[0], "")
+    for column in columns[1:]:
+        blob = blob + " " + func.coalesce(column, "")
+    return func.lower(blob)
+
 class Contact(Base):
     __tablename__ = 'contacts'
     id = Column(Integer, primary_key=True, index=True)
@@ -20,4 +34,56 @@ class Contact(Base):
 
     # Legacy fields for backward compatibility (will be migrated)
     phone = Column(String, nullable=True)  # Maps to telephone
-    address = Column(Text, nullable=True)  # Maps to company address or notes
\ No newline at end of file
+    address = Column(Text, nullable=True)  # Maps to company address or notes
+
+# Composite (sort column, id) indexes back keyset pagination in advanced search
+Index("ix_contacts_name_id", Contact.name, Contact.id)
+Index("ix_contacts_created_at_id", Contact.created_at, Contact.id)
+Index("ix_contacts_updated_at_id", Contact.updated_at, Contact.id)
+
+# Postgres search support: pg_trgm GIN indexes let ILIKE '%term%' predicates
+# in AdvancedSearchService use an index instead of a sequential scan.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+# Typeahead suggestions match lower(name) by trigram word similarity
+Index(
+    "contacts_name_lower_trgm",
+    func.lower(Contact.name).label("name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"name_lower": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+
+# Term search: a generated search_blob column with one trigram index, so each
+# term is a single index probe across all searchable fields. It is created and
+# queried only through SQL (not mapped on Contact), so databases without it can
+# still insert contacts; other dialects match the expression inline instead.
+SEARCH_BLOB_SQL = str(search_blob_expression(
+    [literal_column(column, Text) for column in SEARCH_BLOB_COLUMNS]
+).compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+SEARCH_BLOB_DDL = (
+    f"ALTER TABLE contacts ADD COLUMN IF NOT EXISTS search_blob TEXT "
+    f"GENERATED ALWAYS AS ({SEARCH_BLOB_SQL}) STORED",
+    "CREATE INDEX IF NOT EXISTS contacts_search_blob_trgm ON contacts USING gin (search_blob gin_trgm_ops)",
+)
+
+# Full-text search: a generated tsvector column with its own GIN index, so
+# multi-term queries intersect posting lists instead of scanning substrings.
+SEARCH_VECTOR_DDL = (
+    "ALTER TABLE contacts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', "
+    "coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || "
+    "coalesce(address, '') || ' ' || coalesce(category, '') || ' ' || "
+    "coalesce(notes, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS contacts_fts ON contacts USING gin (search_vector)",
+)
+
+for _statement in SEARCH_BLOB_DDL + SEARCH_VECTOR_DDL:
+    event.listen(
+        Contact.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql")
+    )
@@ -22,6 +22,7 @@ class AdvancedSearchRequest(BaseModel):
     sort_order: Optional[str] = "asc"
     page: Optional[int] = 1
     page_size: Optional[int] = 20
+    cursor: Optional[List[Any]] = None  # next_cursor from the previous page
     
     @validator('sort_by')
     def validate_sort_by(cls, v):
@@ -35,6 +36,12 @@ class AdvancedSearchRequest(BaseModel):
         if v not in ['asc', 'desc']:
             raise ValueError('sort_order must be "asc" or "desc"')
         return v
+    
+    @validator('cursor')
+    def validate_cursor(cls, v):
+        if v is not None and len(v) != 2:
+            raise ValueError('cursor must be [sort_value, id]')
+        return v
 
 class SavedFilterCreate(BaseModel):
     name: str
@@ -82,6 +89,8 @@ class SearchResult(BaseModel):
     page_size: int
     total_pages: int
     execution_time_ms: int
+    next_cursor: Optional[List[Any]] = None  # [sort value, id] for keyset pagination
+    total_count_is_estimate: bool = False  # total_count is the planner's row estimate, not an exact count
 
 class SearchSuggestion(BaseModel):
     type: str  # 'name', 'email', 'category', etc.
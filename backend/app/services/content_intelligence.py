@@ -3,78 +3,128 @@ Content Intelligence Service
 Combines LLM and SpaCy for intelligent content detection and extraction across all file types
 """
 import os
+import functools
 import json
 import logging
 import asyncio
 from typing import Dict, List, Any, Optional, Tuple
 import re
+import time
+import threading
 from datetime import datetime
+from importlib.util import find_spec
 
 logger = logging.getLogger(__name__)
 
-# Optional imports with graceful fallback
-try:
-    import spacy
-    from spacy.matcher import Matcher
-    SPACY_AVAILABLE = True
+# Optional dependencies are only located here; spacy and openai themselves
+# are imported when the model and clients are first needed
+SPACY_AVAILABLE = find_spec("spacy") is not None
+if SPACY_AVAILABLE:
     logger.info("✅ SpaCy available")
-except ImportError:
-    SPACY_AVAILABLE = False
+else:
     logger.warning("⚠️ SpaCy not available")
 
-try:
-    import openai
-    LLM_AVAILABLE = True
+LLM_AVAILABLE = find_spec("openai") is not None
+if LLM_AVAILABLE:
     logger.info("✅ OpenAI client available")
-except ImportError:
-    LLM_AVAILABLE = False
+else:
     logger.warning("⚠️ OpenAI client not available")
 
+# Contact patterns shared by the SpaCy pass, the LLM fallback and validation;
+# the character classes already cover both cases, so no IGNORECASE is needed
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'[\+]?[1-9][\d\s\-\(\)]{7,14}')
+
 class ContentIntelligenceService:
     """
     Advanced content intelligence combining LLM and SpaCy for accurate contact extraction
     """
     
     def __init__(self):
-        self.spacy_model = None
-        self.matcher = None
-        self.llm_clients = {}
-        self.providers = {}  # Alias for compatibility
-        self.default_provider = None
         self.business_categories = [
             "Government", "Embassy", "Consulate", "High Commissioner",
             "Deputy High Commissioner", "Associations", "Exporter", "Importer",
             "Logistics", "Event management", "Consultancy", "Manufacturer",
             "Distributors", "Producers", "Others"
         ]
-
-        self._initialize_spacy()
-        self._initialize_llm_clients()
+        # Serialize the first load of the SpaCy model and of the LLM clients across threads
+        self._spacy_lock = threading.Lock()
+        self._llm_lock = threading.Lock()
+
+    @functools.cached_property
+    def _spacy(self) -> Tuple[Any, Any]:
+        """(model, matcher), loaded on first use; (None, None) without SpaCy"""
+        with self._spacy_lock:
+            # Another thread may have finished loading while this one waited
+            if "_spacy" in self.__dict__:
+                return self.__dict__["_spacy"]
+            return self._initialize_spacy()
+
+    @functools.cached_property
+    def _llm(self) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+        """(clients by provider name, default provider), set up on first use"""
+        with self._llm_lock:
+            if "_llm" in self.__dict__:
+                return self.__dict__["_llm"]
+            return self._initialize_llm_clients()
+
+    @property
+    def spacy_model(self):
+        return self._spacy[0]
+
+    @property
+    def matcher(self):
+        return self._spacy[1]
+
+    @property
+    def llm_clients(self) -> Dict[str, Dict[str, Any]]:
+        return self._llm[0]
+
+    @property
+    def providers(self) -> Dict[str, Dict[str, Any]]:
+        """Alias of llm_clients for compatibility"""
+        return self._llm[0]
+
+    @property
+    def default_provider(self) -> Optional[str]:
+        return self._llm[1]
+
+    async def warmup(self):
+        """
+        Load the SpaCy model and LLM clients in worker threads; both block (model load,
+        Groq probe call), so async callers run this before touching them
+        """
+        pending = [name for name in ("_spacy", "_llm") if name not in self.__dict__]
+        if pending:
+            await asyncio.gather(*(asyncio.to_thread(getattr, self, name) for name in pending))
     
-    def _initialize_spacy(self):
-        """Initialize SpaCy model and custom matchers"""
+    def _initialize_spacy(self) -> Tuple[Any, Any]:
+        """Load the SpaCy model and build its custom matcher"""
         if not SPACY_AVAILABLE:
             logger.warning("SpaCy not available, using rule-based extraction only")
-            return
+            return None, None
         
+        import spacy
+        from spacy.matcher import Matcher
+
         try:
             # Try to load the model
             model_name = os.getenv("SPACY_MODEL", "en_core_web_sm")
-            self.spacy_model = spacy.load(model_name)
-            self.matcher = Matcher(self.spacy_model.vocab)
+            spacy_model = spacy.load(model_name)
+            matcher = Matcher(spacy_model.vocab)
             
             # Add custom patterns for business entities
-            self._add_business_patterns()
+            self._add_business_patterns(matcher)
             logger.info(f"✅ SpaCy model '{model_name}' loaded successfully")
+            return spacy_model, matcher
             
         except OSError as e:
             logger.warning(f"⚠️ SpaCy model not found: {e}")
-            self.spacy_model = None
-            self.matcher = None
+            return None, None
     
-    def _add_business_patterns(self):
+    def _add_business_patterns(self, matcher):
         """Add custom patterns for business entity recognition"""
-        if not self.matcher:
+        if not matcher:
             logger.warning("⚠️ Matcher not available, skipping pattern addition")
             return
 
@@ -110,38 +160,42 @@ class ContentIntelligenceService:
 
             # Add patterns to matcher with error handling
             try:
-                self.matcher.add("DESIGNATION", designation_patterns)
+                matcher.add("DESIGNATION", designation_patterns)
                 logger.debug("✅ Added designation patterns")
             except Exception as e:
                 logger.warning(f"⚠️ Failed to add designation patterns: {e}")
 
             try:
-                self.matcher.add("COMPANY_TYPE", company_patterns)
+                matcher.add("COMPANY_TYPE", company_patterns)
                 logger.debug("✅ Added company type patterns")
             except Exception as e:
                 logger.warning(f"⚠️ Failed to add company type patterns: {e}")
 
             try:
-                self.matcher.add("EMAIL_PATTERN", email_patterns)
+                matcher.add("EMAIL_PATTERN", email_patterns)
                 logger.debug("✅ Added email patterns")
             except Exception as e:
                 logger.warning(f"⚠️ Failed to add email patterns: {e}")
 
-            logger.info(f"✅ Added {len(self.matcher)} custom patterns to SpaCy matcher")
+            logger.info(f"✅ Added {len(matcher)} custom patterns to SpaCy matcher")
 
         except Exception as e:
             logger.error(f"❌ Failed to add business patterns: {e}")
             # Create a minimal matcher to avoid warnings
             try:
                 simple_pattern = [[{"LOWER": "email"}]]
-                self.matcher.add("SIMPLE", simple_pattern)
+                matcher.add("SIMPLE", simple_pattern)
                 logger.info("✅ Added minimal pattern to avoid matcher warnings")
             except:
                 logger.warning("⚠️ Could not add even simple patterns to matcher")
     
-    def _initialize_llm_clients(self):
-        """Initialize multiple LLM clients"""
+    def _initialize_llm_clients(self) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+        """Set up the configured LLM clients; returns them by provider name with the default provider"""
         logger.info("🔧 Initializing LLM clients...")
+        llm_clients = {}
+        default_provider = None
+        if LLM_AVAILABLE:
+            import openai
 
         # OpenAI (or OpenAI-compatible)
         openai_key = os.getenv("OPENAI_API_KEY")
@@ -150,14 +204,13 @@ class ContentIntelligenceService:
         if openai_key and LLM_AVAILABLE:
             try:
                 base_url = os.getenv("OPENAI_BASE_URL")
-                self.llm_clients["openai"] = {
+                llm_clients["openai"] = {
                     "client": openai.OpenAI(api_key=openai_key, base_url=base_url),
                     "model": os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
                     "type": "openai"
                 }
-                self.providers["openai"] = self.llm_clients["openai"]  # Alias
-                if not self.default_provider:
-                    self.default_provider = "openai"
+                if not default_provider:
+                    default_provider = "openai"
                 logger.info("✅ OpenAI client initialized")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize OpenAI client: {e}")
@@ -173,7 +226,7 @@ class ContentIntelligenceService:
                 if not groq_key.startswith("gsk_"):
                     logger.warning(f"⚠️ Groq API key doesn't start with 'gsk_', may be invalid")
 
-                self.llm_clients["groq"] = {
+                llm_clients["groq"] = {
                     "client": openai.OpenAI(
                         api_key=groq_key.strip(),
                         base_url="https://api.groq.com/openai/v1"
@@ -181,15 +234,14 @@ class ContentIntelligenceService:
                     "model": os.getenv("GROQ_MODEL", "mixtral-8x7b-32768"),
                     "type": "openai_compatible"
                 }
-                self.providers["groq"] = self.llm_clients["groq"]  # Alias
-                if not self.default_provider:
-                    self.default_provider = "groq"
+                if not default_provider:
+                    default_provider = "groq"
                 logger.info("✅ Groq client initialized successfully")
 
                 # Test the client with a simple call
                 try:
-                    test_response = self.llm_clients["groq"]["client"].chat.completions.create(
-                        model=self.llm_clients["groq"]["model"],
+                    test_response = llm_clients["groq"]["client"].chat.completions.create(
+                        model=llm_clients["groq"]["model"],
                         messages=[{"role": "user", "content": "Hello"}],
                         max_tokens=10
                     )
@@ -200,10 +252,9 @@ class ContentIntelligenceService:
                 except Exception as test_e:
                     logger.error(f"❌ Groq client test call failed: {test_e}")
                     # Remove the client if test fails
-                    del self.llm_clients["groq"]
-                    del self.providers["groq"]
-                    if self.default_provider == "groq":
-                        self.default_provider = None
+                    del llm_clients["groq"]
+                    if default_provider == "groq":
+                        default_provider = None
 
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Groq client: {e}")
@@ -215,22 +266,24 @@ class ContentIntelligenceService:
             elif not LLM_AVAILABLE:
                 logger.warning("⚠️ OpenAI library not available for Groq client")
 
-        if not self.llm_clients:
+        if not llm_clients:
             logger.warning("⚠️ No LLM clients configured - using SpaCy fallback only")
-            self.default_provider = None
+            default_provider = None
         else:
-            logger.info(f"🤖 Default LLM provider: {self.default_provider}")
-            logger.info(f"📊 Available providers: {list(self.providers.keys())}")
+            logger.info(f"🤖 Default LLM provider: {default_provider}")
+            logger.info(f"📊 Available providers: {list(llm_clients.keys())}")
 
         # Log environment variables for debugging
         logger.debug(f"Environment check - OPENAI_API_KEY: {bool(os.getenv('OPENAI_API_KEY'))}")
         logger.debug(f"Environment check - GROQ_API_KEY: {bool(os.getenv('GROQ_API_KEY'))}")
+        return llm_clients, default_provider
     
     async def analyze_content(self, text: str, file_type: str = "unknown") -> Dict[str, Any]:
         """
         Comprehensive content analysis using both SpaCy and LLM
         """
         logger.info(f"Analyzing {len(text)} characters of {file_type} content")
+        await self.warmup()
         
         # Step 1: SpaCy-based entity extraction
         spacy_results = self._extract_with_spacy(text)
@@ -242,6 +295,10 @@ class ContentIntelligenceService:
         combined_results = self._combine_results(spacy_results, llm_results, text)
         
         final_contacts = combined_results["contacts"]
+        # Primary category as the single string the contacts table stores
+        for contact in final_contacts:
+            categories = contact.get("categories") or ["Others"]
+            contact["category"] = categories[0] if isinstance(categories, list) else str(categories)
         logger.info(f"🎯 Final analysis complete: {len(final_contacts)} contacts extracted")
 
         if final_contacts:
@@ -252,6 +309,7 @@ class ContentIntelligenceService:
             logger.debug(f"SpaCy entities: {spacy_results.get('entities', {})}")
             logger.debug(f"LLM results: {llm_results}")
 
+        timestamp_ns = time.time_ns()
         return {
             "success": True,
             "file_type": file_type,
@@ -267,17 +325,19 @@ class ContentIntelligenceService:
                 "text_length": len(text),
                 "entities_found": len(spacy_results.get("entities", [])),
                 "contacts_extracted": len(combined_results["contacts"]),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcfromtimestamp(timestamp_ns / 1e9).isoformat(),
+                "timestamp_ns": timestamp_ns
             }
         }
     
-    def _extract_with_spacy(self, text: str) -> Dict[str, Any]:
-        """Extract entities using SpaCy NLP"""
+    def _extract_with_spacy(self, text: str, doc=None) -> Dict[str, Any]:
+        """Extract entities using SpaCy NLP (doc: an already processed Doc for text)"""
         if not self.spacy_model:
             return {"entities": [], "method": "rule_based"}
         
         try:
-            doc = self.spacy_model(text)
+            if doc is None:
+                doc = self.spacy_model(text)
             
             entities = {
                 "PERSON": [],
@@ -317,10 +377,7 @@ class ContentIntelligenceService:
                 logger.warning(f"⚠️ Custom pattern matching failed: {e}")
             
             # Extract emails and phones with regex (more reliable)
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            phone_pattern = r'[\+]?[1-9][\d\s\-\(\)]{7,14}'  # More precise phone pattern
-            
-            for match in re.finditer(email_pattern, text, re.IGNORECASE):
+            for match in EMAIL_PATTERN.finditer(text):
                 entities["EMAIL"].append({
                     "text": match.group(),
                     "start": match.start(),
@@ -328,7 +385,7 @@ class ContentIntelligenceService:
                     "confidence": 0.9
                 })
             
-            for match in re.finditer(phone_pattern, text):
+            for match in PHONE_PATTERN.finditer(text):
                 phone_text = match.group().strip()
                 if len(phone_text) >= 8:  # Ensure minimum phone length
                     entities["PHONE"].append({
@@ -605,8 +662,7 @@ RESPOND WITH JSON ARRAY:"""
 
         # Validate email
         if contact["email"]:
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            if not re.match(email_pattern, contact["email"]):
+            if not EMAIL_PATTERN.match(contact["email"]):
                 # Try to find a valid email in SpaCy results
                 spacy_emails = [e["text"] for e in entities.get("EMAIL", [])]
                 if spacy_emails:
@@ -895,13 +951,13 @@ RESPOND WITH JSON ARRAY:"""
 
                 # Look for email if not found
                 if not contact["email"] and '@' in line:
-                    email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', line, re.IGNORECASE)
+                    email_match = EMAIL_PATTERN.search(line)
                     if email_match:
                         contact["email"] = email_match.group()
 
                 # Look for phone if not found
                 if not contact["phone"] and any(char.isdigit() for char in line):
-                    phone_match = re.search(r'[\+]?[1-9][\d\s\-\(\)]{7,14}', line)
+                    phone_match = PHONE_PATTERN.search(line)
                     if phone_match:
                         contact["phone"] = phone_match.group().strip()
 
@@ -2,19 +2,63 @@
 Advanced search service with full-text search capabilities
 """
 import time
+import json
+import asyncio
 import logging
+from collections import deque
+from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func, text
-from ..models import Contact
+from sqlalchemy import and_, func, text, bindparam, literal, literal_column, select, tuple_
+from ..database import SessionLocal
+from ..models import Contact, SEARCH_BLOB_COLUMNS, search_blob_expression
 from ..models.search import SearchHistory
 from ..schemas.search import SearchCriteria, SearchResult, SearchSuggestion
 
 logger = logging.getLogger(__name__)
 
+# Total counts are shared by every page of the same search for a short while
+COUNT_CACHE_TTL_SECONDS = 60
+COUNT_CACHE_MAX_ENTRIES = 1024
+# Criteria matched with ILIKE, whose counts do not depend on case
+CASE_INSENSITIVE_CRITERIA = ("name", "email", "address", "notes")
+# Search history is buffered and written in batches off the request path
+SEARCH_LOG_FLUSH_INTERVAL_SECONDS = 2
+SEARCH_LOG_FLUSH_BATCH_SIZE = 500
+# Terms shorter than this are ignored; at most MAX_SEARCH_TERMS are matched
+MIN_SEARCH_TERM_LENGTH = 2
+MAX_SEARCH_TERMS = 8
+# Columns returned for each search hit
+SEARCH_RESULT_COLUMNS = (
+    Contact.id, Contact.name, Contact.email, Contact.phone, Contact.address,
+    Contact.category, Contact.notes, Contact.created_at, Contact.updated_at
+)
+
+# Postgres full-text search is the hot path, so its statements are built
+# once with bind parameters and reuse SQLAlchemy's compiled-SQL cache entry
+_SEARCH_VECTOR = literal_column("search_vector")
+# The generated search_blob column exists only on Postgres (see models.SEARCH_BLOB_DDL);
+# elsewhere the same expression is evaluated inline
+_SEARCH_BLOB = literal_column("search_blob")
+_SEARCH_BLOB_INLINE = search_blob_expression([getattr(Contact, column) for column in SEARCH_BLOB_COLUMNS])
+_TS_QUERY = func.plainto_tsquery('simple', bindparam("q"))
+FULL_TEXT_CONDITION = _SEARCH_VECTOR.op("@@")(_TS_QUERY)
+FULL_TEXT_STMT = select(*SEARCH_RESULT_COLUMNS)\
+    .where(FULL_TEXT_CONDITION)\
+    .order_by(func.ts_rank(_SEARCH_VECTOR, _TS_QUERY).desc())\
+    .offset(bindparam("offset"))\
+    .limit(bindparam("limit"))
+
+# Non-nullable sort columns that support keyset (seek) pagination
+KEYSET_SORT_FIELDS = ("name", "created_at", "updated_at")
+# Minimum pg_trgm word similarity for a name to be suggested
+SUGGESTION_WORD_SIMILARITY_THRESHOLD = 0.5
+
 class AdvancedSearchService:
     def __init__(self):
         self.search_history = []
+        self._count_cache: Dict[str, Tuple[float, int]] = {}
+        self._pending_logs = deque()
     
     def full_text_search(
         self, 
@@ -26,46 +70,38 @@ class AdvancedSearchService:
         """Perform full-text search across all contact fields"""
         start_time = time.time()
         
-        # Build search conditions
-        search_terms = query.lower().split()
-        conditions = []
-        
-        for term in search_terms:
-            term_conditions = [
-                func.lower(Contact.name).contains(term),
-                func.lower(Contact.email).contains(term),
-                func.lower(Contact.phone).contains(term),
-                func.lower(Contact.address).contains(term),
-                func.lower(Contact.category).contains(term),
-                func.lower(Contact.notes).contains(term)
-            ]
-            conditions.append(or_(*term_conditions))
-        
-        # Combine all conditions with AND
-        final_condition = and_(*conditions) if conditions else text("1=1")
-        
-        # Get total count
-        total_count = db.query(Contact).filter(final_condition).count()
-        
-        # Get paginated results
         offset = (page - 1) * page_size
-        contacts = db.query(Contact).filter(final_condition)\
-            .offset(offset).limit(page_size).all()
-        
-        # Convert to dict format
-        contact_dicts = []
-        for contact in contacts:
-            contact_dicts.append({
-                'id': contact.id,
-                'name': contact.name,
-                'email': contact.email,
-                'phone': contact.phone,
-                'address': contact.address,
-                'category': contact.category,
-                'notes': contact.notes,
-                'created_at': contact.created_at,
-                'updated_at': contact.updated_at
-            })
+        count_key = f"full_text:{' '.join(query.lower().split())}"
+        if db.get_bind().dialect.name == "postgresql":
+            # Prebuilt statements against the GIN-indexed search_vector column
+            rows = db.execute(
+                FULL_TEXT_STMT, {"q": query, "offset": offset, "limit": page_size}
+            ).mappings()
+            contact_dicts = [dict(row) for row in rows]
+            total_count = self._get_total_count(
+                db, count_key, FULL_TEXT_CONDITION, {"q": query},
+                first_page_rows=len(contact_dicts) if offset == 0 else None, page_size=page_size
+            )
+        else:
+            # Build search conditions
+            conditions = []
+            
+            for term in self._search_terms(query):
+                conditions.append(self._term_condition(db, term))
+            
+            # Combine all conditions with AND
+            final_condition = and_(*conditions) if conditions else text("1=1")
+            
+            # Get paginated results as plain rows (no ORM object hydration)
+            stmt = select(*SEARCH_RESULT_COLUMNS).where(final_condition)\
+                .offset(offset).limit(page_size)
+            contact_dicts = [dict(row) for row in db.execute(stmt).mappings()]
+            
+            # Get total count
+            total_count = self._get_total_count(
+                db, count_key, final_condition,
+                first_page_rows=len(contact_dicts) if offset == 0 else None, page_size=page_size
+            )
         
         execution_time = int((time.time() - start_time) * 1000)
         total_pages = (total_count + page_size - 1) // page_size
@@ -89,7 +125,8 @@ class AdvancedSearchService:
         sort_by: str = "name",
         sort_order: str = "asc",
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: Optional[List[Any]] = None
     ) -> SearchResult:
         """Perform advanced search with specific field criteria"""
         start_time = time.time()
@@ -99,36 +136,27 @@ class AdvancedSearchService:
         
         if criteria.query:
             # General search across all fields
-            search_terms = criteria.query.lower().split()
-            for term in search_terms:
-                term_conditions = [
-                    func.lower(Contact.name).contains(term),
-                    func.lower(Contact.email).contains(term),
-                    func.lower(Contact.phone).contains(term),
-                    func.lower(Contact.address).contains(term),
-                    func.lower(Contact.category).contains(term),
-                    func.lower(Contact.notes).contains(term)
-                ]
-                conditions.append(or_(*term_conditions))
+            for term in self._search_terms(criteria.query):
+                conditions.append(self._term_condition(db, term))
         
         # Specific field searches
         if criteria.name:
-            conditions.append(func.lower(Contact.name).contains(criteria.name.lower()))
+            conditions.append(Contact.name.ilike(f"%{criteria.name}%"))
         
         if criteria.email:
-            conditions.append(func.lower(Contact.email).contains(criteria.email.lower()))
+            conditions.append(Contact.email.ilike(f"%{criteria.email}%"))
         
         if criteria.phone:
             conditions.append(Contact.phone.contains(criteria.phone))
         
         if criteria.address:
-            conditions.append(func.lower(Contact.address).contains(criteria.address.lower()))
+            conditions.append(Contact.address.ilike(f"%{criteria.address}%"))
         
         if criteria.category:
             conditions.append(Contact.category == criteria.category)
         
         if criteria.notes:
-            conditions.append(func.lower(Contact.notes).contains(criteria.notes.lower()))
+            conditions.append(Contact.notes.ilike(f"%{criteria.notes}%"))
         
         if criteria.created_after:
             conditions.append(Contact.created_at >= criteria.created_after)
@@ -137,39 +165,60 @@ class AdvancedSearchService:
             conditions.append(Contact.created_at <= criteria.created_before)
         
         # Combine conditions
-        final_condition = and_(*conditions) if conditions else text("1=1")
+        has_filter = bool(conditions)
+        final_condition = and_(*conditions) if has_filter else text("1=1")
         
         # Build query with sorting
-        query = db.query(Contact).filter(final_condition)
+        stmt = select(*SEARCH_RESULT_COLUMNS).where(final_condition)
         
-        # Apply sorting
+        # Apply sorting (id breaks ties so keyset cursors are stable)
         sort_column = getattr(Contact, sort_by, Contact.name)
         if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
+            stmt = stmt.order_by(sort_column.desc(), Contact.id.desc())
         else:
-            query = query.order_by(sort_column.asc())
-        
-        # Get total count
-        total_count = query.count()
+            stmt = stmt.order_by(sort_column.asc(), Contact.id.asc())
+        
+        # Get paginated results: seek past the cursor when one is given,
+        # otherwise fall back to OFFSET. One extra row detects a next page.
+        use_keyset = sort_by in KEYSET_SORT_FIELDS
+        if cursor and use_keyset:
+            sort_value, last_id = cursor
+            if isinstance(sort_value, str) and sort_by != "name":
+                sort_value = datetime.fromisoformat(sort_value)
+            seek = tuple_(sort_column, Contact.id)
+            if sort_order == "desc":
+                stmt = stmt.where(seek < tuple_(sort_value, last_id))
+            else:
+                stmt = stmt.where(seek > tuple_(sort_value, last_id))
+            stmt = stmt.limit(page_size + 1)
+        else:
+            offset = (page - 1) * page_size
+            stmt = stmt.offset(offset).limit(page_size + 1)
+        
+        # Plain rows (no ORM object hydration)
+        contact_dicts = [dict(row) for row in db.execute(stmt).mappings()]
+        
+        # Get total count. An unfiltered search that does not fit on its first page
+        # reports the planner's table estimate instead of counting every contact,
+        # so its total_count is approximate (flagged by total_count_is_estimate)
+        first_page = not (cursor and use_keyset) and page == 1
+        first_page_rows = len(contact_dicts) if first_page else None
+        total_count = None
+        if not has_filter and (first_page_rows is None or first_page_rows > page_size):
+            total_count = self._estimate_table_count(db)
+        total_count_is_estimate = total_count is not None
+        if total_count is None:
+            total_count = self._get_total_count(
+                db, self._criteria_count_key(criteria), final_condition,
+                first_page_rows=first_page_rows, page_size=page_size + 1
+            )
         
-        # Get paginated results
-        offset = (page - 1) * page_size
-        contacts = query.offset(offset).limit(page_size).all()
-        
-        # Convert to dict format
-        contact_dicts = []
-        for contact in contacts:
-            contact_dicts.append({
-                'id': contact.id,
-                'name': contact.name,
-                'email': contact.email,
-                'phone': contact.phone,
-                'address': contact.address,
-                'category': contact.category,
-                'notes': contact.notes,
-                'created_at': contact.created_at,
-                'updated_at': contact.updated_at
-            })
+        next_cursor = None
+        if len(contact_dicts) > page_size:
+            contact_dicts = contact_dicts[:page_size]
+            if use_keyset:
+                last = contact_dicts[-1]
+                next_cursor = [last[sort_by], last['id']]
         
         execution_time = int((time.time() - start_time) * 1000)
         total_pages = (total_count + page_size - 1) // page_size
@@ -184,7 +233,9 @@ class AdvancedSearchService:
             page=page,
             page_size=page_size,
             total_pages=total_pages,
-            execution_time_ms=execution_time
+            execution_time_ms=execution_time,
+            next_cursor=next_cursor,
+            total_count_is_estimate=total_count_is_estimate
         )
     
     def get_search_suggestions(self, db: Session, query: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -193,46 +244,164 @@ class AdvancedSearchService:
         query_lower = query.lower()
         
         # Name suggestions
-        names = db.query(Contact.name).filter(
-            func.lower(Contact.name).contains(query_lower)
-        ).distinct().limit(limit).all()
-        
-        for name in names:
-            if name[0]:
-                suggestions.append({
-                    'type': 'name',
-                    'value': name[0],
-                    'count': db.query(Contact).filter(Contact.name == name[0]).count()
-                })
+        if db.get_bind().dialect.name == "postgresql":
+            # Index-backed trigram match on lower(name), closest names first
+            name_lower = func.lower(Contact.name)
+            db.execute(
+                text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+                {"threshold": str(SUGGESTION_WORD_SIMILARITY_THRESHOLD)}
+            )
+            names = db.query(Contact.name, func.count(Contact.id))\
+                .filter(literal(query_lower).op("<%")(name_lower))\
+                .group_by(Contact.name)\
+                .order_by(func.word_similarity(query_lower, name_lower).desc())\
+                .limit(limit).all()
+        else:
+            names = db.query(Contact.name, func.count(Contact.id))\
+                .filter(Contact.name.ilike(f"%{query_lower}%"))\
+                .group_by(Contact.name)\
+                .order_by(func.count(Contact.id).desc())\
+                .limit(limit).all()
+        
+        suggestions.extend(
+            {'type': 'name', 'value': name, 'count': count}
+            for name, count in names if name
+        )
         
         # Category suggestions
-        categories = db.query(Contact.category).filter(
-            func.lower(Contact.category).contains(query_lower)
-        ).distinct().limit(limit).all()
-        
-        for category in categories:
-            if category[0]:
-                suggestions.append({
-                    'type': 'category',
-                    'value': category[0],
-                    'count': db.query(Contact).filter(Contact.category == category[0]).count()
-                })
+        categories = db.query(Contact.category, func.count(Contact.id))\
+            .filter(Contact.category.ilike(f"%{query_lower}%"))\
+            .group_by(Contact.category)\
+            .order_by(func.count(Contact.id).desc())\
+            .limit(limit).all()
+        
+        suggestions.extend(
+            {'type': 'category', 'value': category, 'count': count}
+            for category, count in categories if category
+        )
         
         return suggestions[:limit]
     
+    def _get_total_count(
+        self, db: Session, cache_key: str, condition, params: Optional[Dict[str, Any]] = None,
+        first_page_rows: Optional[int] = None, page_size: int = 0
+    ) -> int:
+        """
+        Get the exact total result count, reusing a recent count for the same search;
+        a first page with room to spare already holds every match, so it needs no COUNT(*)
+        """
+        now = time.time()
+        cached = self._count_cache.get(cache_key)
+        if cached and now - cached[0] < COUNT_CACHE_TTL_SECONDS:
+            return cached[1]
+        
+        if first_page_rows is not None and first_page_rows < page_size:
+            total_count = first_page_rows
+        else:
+            total_count = db.execute(
+                select(func.count()).select_from(Contact).where(condition), params or {}
+            ).scalar()
+        
+        if len(self._count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+            self._count_cache = {
+                key: entry for key, entry in self._count_cache.items()
+                if now - entry[0] < COUNT_CACHE_TTL_SECONDS
+            }
+        self._count_cache[cache_key] = (now, total_count)
+        return total_count
+    
+    def _estimate_table_count(self, db: Session) -> Optional[int]:
+        """Read the planner's contacts row estimate from pg_class (Postgres only)"""
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+            {"table": Contact.__tablename__}
+        ).scalar()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+    
+    def _criteria_count_key(self, criteria: SearchCriteria) -> str:
+        """
+        Cache key for an advanced search count. The query is keyed by the terms it
+        filters on and the ILIKE fields by lowercase value; whitespace elsewhere is
+        matched literally, so it is kept
+        """
+        normalized = {}
+        for field, value in criteria.dict().items():
+            if value is None or value == "":
+                continue
+            if field == "query":
+                value = sorted(self._search_terms(value))
+            elif field in CASE_INSENSITIVE_CRITERIA:
+                value = value.lower()
+            normalized[field] = value
+        return f"advanced:{json.dumps(normalized, sort_keys=True, default=str)}"
+    
+    def _search_terms(self, query: str) -> List[str]:
+        """Split a query into unique search terms, most selective (longest) first"""
+        words = query.lower().split()
+        terms = []
+        for term in dict.fromkeys(words):
+            if len(term) >= MIN_SEARCH_TERM_LENGTH:
+                terms.append(term)
+                if len(terms) >= MAX_SEARCH_TERMS:
+                    break
+        
+        # A query made only of short words still filters on its first word
+        if not terms and words:
+            terms = words[:1]
+        
+        terms.sort(key=len, reverse=True)
+        return terms
+    
+    def _term_condition(self, db: Session, term: str):
+        """Match a search term against any searchable column"""
+        # On Postgres a single ILIKE on the combined column is one pg_trgm
+        # index probe instead of six per-column predicates
+        if db.get_bind().dialect.name == "postgresql":
+            return _SEARCH_BLOB.ilike(f"%{term}%")
+        return _SEARCH_BLOB_INLINE.ilike(f"%{term}%")
+    
     def _log_search(self, db: Session, query: str, search_type: str, results_count: int, execution_time: int):
-        """Log search for analytics"""
+        """Queue a search log for analytics (written by flush_search_logs)"""
+        self._pending_logs.append(SearchHistory(
+            search_query=query[:500],  # Truncate if too long
+            search_type=search_type,
+            results_count=results_count,
+            execution_time_ms=execution_time
+        ))
+    
+    def flush_search_logs(self) -> int:
+        """Write up to one batch of queued search logs; returns the number written"""
+        batch = []
+        while self._pending_logs and len(batch) < SEARCH_LOG_FLUSH_BATCH_SIZE:
+            batch.append(self._pending_logs.popleft())
+        if not batch:
+            return 0
+        
+        db = SessionLocal()
         try:
-            search_log = SearchHistory(
-                search_query=query[:500],  # Truncate if too long
-                search_type=search_type,
-                results_count=results_count,
-                execution_time_ms=execution_time
-            )
-            db.add(search_log)
+            db.bulk_save_objects(batch)
             db.commit()
         except Exception as e:
-            logger.warning(f"Failed to log search: {e}")
+            db.rollback()
+            logger.warning(f"Failed to log {len(batch)} searches: {e}")
+        finally:
+            db.close()
+        return len(batch)
+    
+    async def run_search_log_flusher(self):
+        """Periodically flush queued search logs (started on app startup)"""
+        while True:
+            await asyncio.sleep(SEARCH_LOG_FLUSH_INTERVAL_SECONDS)
+            try:
+                while await asyncio.to_thread(self.flush_search_logs) == SEARCH_LOG_FLUSH_BATCH_SIZE:
+                    pass
+            except Exception:
+                # Keep flushing on the next tick rather than letting the task die
+                logger.exception("Failed to flush search logs")
 
 # Global search service instance
 search_service = AdvancedSearchService()
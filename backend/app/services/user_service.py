@@ -3,15 +3,26 @@ User service layer for authentication and user management
 """
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
+from sqlalchemy import or_, func, select
 from datetime import datetime, timedelta
 import logging
 
+from ..database import SessionLocal
 from ..models.user import User, UserRole
 from ..schemas.auth import UserCreate, UserUpdate
 from ..auth.security import get_password_hash, verify_password
 
 logger = logging.getLogger(__name__)
 
+# Columns needed by user list views (no password hash)
+USER_LIST_COLUMNS = (
+    User.id, User.username, User.email, User.full_name, User.role,
+    User.is_active, User.is_verified, User.created_at, User.last_login
+)
+
+# Skip last_login writes for users who logged in within this window
+LAST_LOGIN_UPDATE_INTERVAL = timedelta(seconds=60)
+
 class UserService:
     """Service class for user operations with business logic"""
     
@@ -22,11 +33,7 @@ class UserService:
         """Create a new user with validation"""
         try:
             # Business logic: validate user data
-            if self.get_user_by_username(db, user_data.username):
-                raise ValueError("Username already exists")
-            
-            if self.get_user_by_email(db, user_data.email):
-                raise ValueError("Email already exists")
+            self._check_unique(db, user_data.username, user_data.email)
             
             # Validate password strength
             if len(user_data.password) < 8:
@@ -56,6 +63,23 @@ class UserService:
             self.logger.error(f"Error creating user: {e}")
             raise
     
+    def _check_unique(self, db: Session, username: Optional[str], email: Optional[str]) -> None:
+        """Raise ValueError if the username or email is already taken (one query)"""
+        conditions = []
+        if username:
+            conditions.append(User.username == username)
+        if email:
+            conditions.append(User.email == email)
+        if not conditions:
+            return
+        
+        existing = db.query(User.username, User.email)\
+            .filter(or_(*conditions)).limit(1).first()
+        if existing:
+            if username and existing.username == username:
+                raise ValueError("Username already exists")
+            raise ValueError("Email already exists")
+    
     def get_user_by_id(self, db: Session, user_id: int) -> Optional[User]:
         """Get user by ID"""
         return db.query(User).filter(User.id == user_id).first()
@@ -81,10 +105,7 @@ class UserService:
             if not user.is_active:
                 return None
             
-            # Update last login
-            user.last_login = datetime.utcnow()
-            db.commit()
-            
+            # last_login is recorded by update_last_login off the request path
             self.logger.info(f"User authenticated: {username}")
             return user
             
@@ -92,6 +113,22 @@ class UserService:
             self.logger.error(f"Authentication error: {e}")
             return None
     
+    def update_last_login(self, user_id: int) -> None:
+        """Record a successful login in its own session (run as a background task)"""
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            db.query(User).filter(
+                User.id == user_id,
+                or_(User.last_login == None, User.last_login < now - LAST_LOGIN_UPDATE_INTERVAL)
+            ).update({User.last_login: now}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.logger.warning(f"Failed to update last login for user {user_id}: {e}")
+        finally:
+            db.close()
+    
     def update_user(
         self, 
         db: Session, 
@@ -112,13 +149,13 @@ class UserService:
             # Validate unique constraints
             update_data = user_data.dict(exclude_unset=True)
             
-            if 'username' in update_data and update_data['username'] != user.username:
-                if self.get_user_by_username(db, update_data['username']):
-                    raise ValueError("Username already exists")
-            
-            if 'email' in update_data and update_data['email'] != user.email:
-                if self.get_user_by_email(db, update_data['email']):
-                    raise ValueError("Email already exists")
+            new_username = update_data.get('username')
+            new_email = update_data.get('email')
+            self._check_unique(
+                db,
+                new_username if new_username != user.username else None,
+                new_email if new_email != user.email else None
+            )
             
             # Role changes require admin privileges
             if 'role' in update_data and current_user.role != UserRole.ADMIN:
@@ -174,21 +211,21 @@ class UserService:
         limit: int = 100,
         role_filter: Optional[UserRole] = None,
         active_only: bool = True
-    ) -> List[User]:
-        """Get users with filtering (admin only)"""
+    ) -> List[Dict[str, Any]]:
+        """Get users with filtering (admin only), as rows of USER_LIST_COLUMNS"""
         try:
             if current_user.role != UserRole.ADMIN:
                 raise PermissionError("Only admins can list users")
             
-            query = db.query(User)
+            stmt = select(*USER_LIST_COLUMNS)
             
             if active_only:
-                query = query.filter(User.is_active == True)
+                stmt = stmt.where(User.is_active == True)
             
             if role_filter:
-                query = query.filter(User.role == role_filter)
+                stmt = stmt.where(User.role == role_filter)
             
-            users = query.offset(skip).limit(limit).all()
+            users = db.execute(stmt.offset(skip).limit(limit)).mappings().all()
             
             self.logger.info(f"Admin {current_user.username} retrieved {len(users)} users")
             return users
@@ -203,28 +240,28 @@ class UserService:
             if current_user.role != UserRole.ADMIN:
                 raise PermissionError("Only admins can access user statistics")
             
-            # Total users
-            total_users = db.query(User).count()
-            active_users = db.query(User).filter(User.is_active == True).count()
+            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+            seven_days_ago = datetime.utcnow() - timedelta(days=7)
+            
+            # Totals, recent registrations (30 days) and recent logins (7 days)
+            # in a single aggregate scan
+            totals = db.query(
+                func.count(User.id).label('total'),
+                func.count(User.id).filter(User.is_active == True).label('active'),
+                func.count(User.id).filter(User.created_at >= thirty_days_ago).label('recent_registrations'),
+                func.count(User.id).filter(User.last_login >= seven_days_ago).label('recent_logins')
+            ).one()
+            total_users = totals.total
+            active_users = totals.active
+            recent_registrations = totals.recent_registrations
+            recent_logins = totals.recent_logins
             
             # Role distribution
             role_stats = db.query(
                 User.role,
-                db.func.count(User.id).label('count')
+                func.count(User.id).label('count')
             ).group_by(User.role).all()
             
-            # Recent registrations (last 30 days)
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            recent_registrations = db.query(User).filter(
-                User.created_at >= thirty_days_ago
-            ).count()
-            
-            # Recent logins (last 7 days)
-            seven_days_ago = datetime.utcnow() - timedelta(days=7)
-            recent_logins = db.query(User).filter(
-                User.last_login >= seven_days_ago
-            ).count()
-            
             stats = {
                 "total_users": total_users,
                 "active_users": active_users,
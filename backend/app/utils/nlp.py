@@ -1,16 +1,201 @@
-def categorize_contact(contact):
-    """Enhanced contact categorization with specialized categories"""
+import bisect
+import re
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# 1. Government & Diplomatic Categories
+GOVERNMENT_KEYWORDS = frozenset([
+    'government', 'ministry', 'minister', 'secretary', 'department', 'bureau',
+    'administration', 'authority', 'commission', 'council', 'municipal',
+    'federal', 'state', 'provincial', 'district', 'county', 'city hall',
+    'public', 'official', 'civil service', 'bureaucrat', 'commissioner'
+])
+
+EMBASSY_KEYWORDS = frozenset([
+    'embassy', 'embassies', 'ambassador', 'ambassadorial', 'diplomatic mission',
+    'diplomatic', 'foreign ministry', 'foreign affairs', 'external affairs'
+])
+
+CONSULATE_KEYWORDS = frozenset([
+    'consulate', 'consular', 'consul', 'vice consul', 'consul general',
+    'consular services', 'visa office', 'passport office'
+])
+
+HIGH_COMMISSIONER_KEYWORDS = frozenset([
+    'high commissioner', 'high commission', 'deputy high commissioner',
+    'assistant high commissioner', 'commonwealth', 'british high commission'
+])
+
+# 2. Business & Trade Categories
+ASSOCIATION_KEYWORDS = frozenset([
+    'association', 'chamber', 'federation', 'union', 'society', 'institute',
+    'foundation', 'organization', 'club', 'guild', 'alliance', 'consortium',
+    'cooperative', 'network', 'forum', 'council', 'board', 'committee'
+])
+
+EXPORTER_KEYWORDS = frozenset([
+    'export', 'exporter', 'exports', 'international trade', 'overseas',
+    'foreign trade', 'global trade', 'shipping', 'freight forwarder',
+    'trade house', 'merchant exporter', 'export house'
+])
+
+IMPORTER_KEYWORDS = frozenset([
+    'import', 'importer', 'imports', 'importing', 'procurement',
+    'sourcing', 'purchasing', 'buying house', 'import house'
+])
+
+LOGISTICS_KEYWORDS = frozenset([
+    'logistics', 'supply chain', 'warehouse', 'distribution', 'transport',
+    'transportation', 'shipping', 'freight', 'cargo', 'courier',
+    'delivery', 'fulfillment', 'storage', '3pl', 'third party logistics'
+])
+
+EVENT_MANAGEMENT_KEYWORDS = frozenset([
+    'event', 'events', 'event management', 'conference', 'exhibition',
+    'trade show', 'expo', 'fair', 'convention', 'seminar', 'workshop',
+    'meeting', 'organizer', 'planner', 'coordinator', 'venue'
+])
+
+# 3. New Business Categories
+CONSULTANCY_KEYWORDS = frozenset([
+    'consultancy', 'consultant', 'consulting', 'advisory', 'advisor',
+    'consulting firm', 'consultants', 'advisory services', 'consulting services',
+    'management consulting', 'business consulting', 'technical consulting'
+])
+
+MANUFACTURER_KEYWORDS = frozenset([
+    'manufacturer', 'manufacturing', 'factory', 'production', 'producer',
+    'industrial', 'plant', 'mill', 'fabrication', 'assembly', 'maker',
+    'manufacturing company', 'production facility', 'industrial unit'
+])
+
+DISTRIBUTOR_KEYWORDS = frozenset([
+    'distributor', 'distribution', 'wholesale', 'wholesaler', 'dealer',
+    'reseller', 'retailer', 'supplier', 'vendor', 'stockist',
+    'distribution center', 'supply chain', 'channel partner'
+])
+
+PRODUCER_KEYWORDS = frozenset([
+    'producer', 'production', 'producer company', 'content producer',
+    'media producer', 'film producer', 'music producer', 'agricultural producer',
+    'food producer', 'energy producer', 'oil producer'
+])
+
+# 4. Additional Categories
+HEALTHCARE_KEYWORDS = frozenset([
+    'hospital', 'clinic', 'medical', 'doctor', 'physician', 'nurse',
+    'healthcare', 'health', 'pharmacy', 'laboratory', 'diagnostic'
+])
+
+EDUCATION_KEYWORDS = frozenset([
+    'school', 'university', 'college', 'institute', 'academy', 'education',
+    'training', 'learning', 'teacher', 'professor', 'student'
+])
+
+FINANCE_KEYWORDS = frozenset([
+    'bank', 'banking', 'finance', 'financial', 'insurance', 'investment',
+    'accounting', 'audit', 'tax', 'credit', 'loan', 'mortgage'
+])
+
+# 4. General Categories
+PERSONAL_KEYWORDS = frozenset([
+    'home', 'personal', 'friend', 'family', 'neighbor', 'buddy', 'mate',
+    'college', 'school', 'university', 'gym', 'club', 'hobby', 'social',
+    'residential', 'apartment', 'house', 'street', 'lane', 'avenue',
+    'sister', 'brother', 'cousin', 'relative', 'gmail', 'yahoo', 'hotmail'
+])
+
+# Keyword categories in priority order (most specific first)
+CATEGORY_KEYWORDS = (
+    # Diplomatic & Government (Highest Priority)
+    ("High Commissioner", HIGH_COMMISSIONER_KEYWORDS),
+    ("Embassy", EMBASSY_KEYWORDS),
+    ("Consulate", CONSULATE_KEYWORDS),
+    ("Government", GOVERNMENT_KEYWORDS),
+    # Business & Trade Categories
+    ("Association", ASSOCIATION_KEYWORDS),
+    ("Exporter", EXPORTER_KEYWORDS),
+    ("Importer", IMPORTER_KEYWORDS),
+    ("Logistics", LOGISTICS_KEYWORDS),
+    ("Event Management", EVENT_MANAGEMENT_KEYWORDS),
+    ("Consultancy", CONSULTANCY_KEYWORDS),
+    ("Manufacturer", MANUFACTURER_KEYWORDS),
+    ("Distributor", DISTRIBUTOR_KEYWORDS),
+    ("Producer", PRODUCER_KEYWORDS),
+    # Specialized Service Categories
+    ("Healthcare", HEALTHCARE_KEYWORDS),
+    ("Education", EDUCATION_KEYWORDS),
+    ("Finance", FINANCE_KEYWORDS),
+)
+
+# Personal keywords are only consulted after the email domain analysis
+PERSONAL_PRIORITY = len(CATEGORY_KEYWORDS)
+
+def _keyword_pattern(keywords):
+    """Compile a keyword set into a single alternation regex"""
+    return re.compile('|'.join(map(re.escape, sorted(keywords))))
+
+# Email domain fragments for the general-category fallback, in priority order
+EMAIL_DOMAIN_CATEGORIES = (
+    ("Government", ('.gov', 'government', 'ministry')),
+    ("Education", ('.edu', '.ac.', 'university', 'college')),
+    ("Personal", ('gmail', 'yahoo', 'hotmail', 'outlook')),
+    ("Business", ('company', 'corp', 'business', 'enterprise', '.org')),
+)
+
+# Fallback matchers when pyahocorasick is unavailable
+CATEGORY_PATTERNS = tuple(
+    (category, _keyword_pattern(keywords)) for category, keywords in CATEGORY_KEYWORDS
+)
+PERSONAL_PATTERN = _keyword_pattern(PERSONAL_KEYWORDS)
+
+_keyword_automaton = None
+
+def _get_keyword_automaton():
+    """Build the Aho-Corasick automaton on first use; values are category priorities"""
+    global _keyword_automaton
+    if _keyword_automaton is None:
+        automaton = ahocorasick.Automaton()
+        keyword_groups = [keywords for _, keywords in CATEGORY_KEYWORDS] + [PERSONAL_KEYWORDS]
+        for priority, keywords in enumerate(keyword_groups):
+            for keyword in keywords:
+                # Shared keywords keep the highest (lowest-index) priority
+                if keyword not in automaton:
+                    automaton.add_word(keyword, priority)
+        automaton.make_automaton()
+        _keyword_automaton = automaton
+    return _keyword_automaton
+
+def _match_priority(all_text):
+    """Return the best category priority whose keywords occur in the text, or None"""
+    if AHOCORASICK_AVAILABLE:
+        return min((priority for _, priority in _get_keyword_automaton().iter(all_text)), default=None)
+
+    for priority, (_, pattern) in enumerate(CATEGORY_PATTERNS):
+        if pattern.search(all_text):
+            return priority
+    if PERSONAL_PATTERN.search(all_text):
+        return PERSONAL_PRIORITY
+    return None
+
+def _contact_text(contact):
+    """Return (all_text, email) for a contact dict or ORM object"""
     if isinstance(contact, dict):
-        name = contact.get("name", "").lower()
-        designation = contact.get("designation", "").lower()
-        company = contact.get("company", "").lower()
-        telephone = contact.get("telephone", "").lower()
+        # all_text is lowercased once below; email is also used on its own
+        name = contact.get("name", "")
+        designation = contact.get("designation", "")
+        company = contact.get("company", "")
+        telephone = contact.get("telephone", "")
         email = contact.get("email", "").lower()
-        website = contact.get("website", "").lower()
-        notes = contact.get("notes", "").lower()
+        website = contact.get("website", "")
+        notes = contact.get("notes", "")
         # Legacy fields
-        phone = contact.get("phone", "").lower()
-        address = contact.get("address", "").lower()
+        phone = contact.get("phone", "")
+        address = contact.get("address", "")
     else:
         name = getattr(contact, "name", "") or ""
         designation = getattr(contact, "designation", "") or ""
@@ -25,168 +210,58 @@ def categorize_contact(contact):
 
     # Combine all text for analysis (prioritize new fields)
     all_text = f"{name} {designation} {company} {telephone} {email} {website} {notes} {phone} {address}".lower()
+    return all_text, email
 
-    # Priority-based categorization (most specific first)
-
-    # 1. Government & Diplomatic Categories
-    government_keywords = [
-        'government', 'ministry', 'minister', 'secretary', 'department', 'bureau',
-        'administration', 'authority', 'commission', 'council', 'municipal',
-        'federal', 'state', 'provincial', 'district', 'county', 'city hall',
-        'public', 'official', 'civil service', 'bureaucrat', 'commissioner'
-    ]
-
-    embassy_keywords = [
-        'embassy', 'embassies', 'ambassador', 'ambassadorial', 'diplomatic mission',
-        'diplomatic', 'foreign ministry', 'foreign affairs', 'external affairs'
-    ]
-
-    consulate_keywords = [
-        'consulate', 'consular', 'consul', 'vice consul', 'consul general',
-        'consular services', 'visa office', 'passport office'
-    ]
-
-    high_commissioner_keywords = [
-        'high commissioner', 'high commission', 'deputy high commissioner',
-        'assistant high commissioner', 'commonwealth', 'british high commission'
-    ]
-
-    # 2. Business & Trade Categories
-    association_keywords = [
-        'association', 'chamber', 'federation', 'union', 'society', 'institute',
-        'foundation', 'organization', 'club', 'guild', 'alliance', 'consortium',
-        'cooperative', 'network', 'forum', 'council', 'board', 'committee'
-    ]
-
-    exporter_keywords = [
-        'export', 'exporter', 'exports', 'international trade', 'overseas',
-        'foreign trade', 'global trade', 'shipping', 'freight forwarder',
-        'trade house', 'merchant exporter', 'export house'
-    ]
-
-    importer_keywords = [
-        'import', 'importer', 'imports', 'importing', 'procurement',
-        'sourcing', 'purchasing', 'buying house', 'import house'
-    ]
-
-    logistics_keywords = [
-        'logistics', 'supply chain', 'warehouse', 'distribution', 'transport',
-        'transportation', 'shipping', 'freight', 'cargo', 'courier',
-        'delivery', 'fulfillment', 'storage', '3pl', 'third party logistics'
-    ]
-
-    event_management_keywords = [
-        'event', 'events', 'event management', 'conference', 'exhibition',
-        'trade show', 'expo', 'fair', 'convention', 'seminar', 'workshop',
-        'meeting', 'organizer', 'planner', 'coordinator', 'venue'
-    ]
-
-    # 3. New Business Categories
-    consultancy_keywords = [
-        'consultancy', 'consultant', 'consulting', 'advisory', 'advisor',
-        'consulting firm', 'consultants', 'advisory services', 'consulting services',
-        'management consulting', 'business consulting', 'technical consulting'
-    ]
-
-    manufacturer_keywords = [
-        'manufacturer', 'manufacturing', 'factory', 'production', 'producer',
-        'industrial', 'plant', 'mill', 'fabrication', 'assembly', 'maker',
-        'manufacturing company', 'production facility', 'industrial unit'
-    ]
-
-    distributor_keywords = [
-        'distributor', 'distribution', 'wholesale', 'wholesaler', 'dealer',
-        'reseller', 'retailer', 'supplier', 'vendor', 'stockist',
-        'distribution center', 'supply chain', 'channel partner'
-    ]
-
-    producer_keywords = [
-        'producer', 'production', 'producer company', 'content producer',
-        'media producer', 'film producer', 'music producer', 'agricultural producer',
-        'food producer', 'energy producer', 'oil producer'
-    ]
-
-    # 4. Additional Categories
-    healthcare_keywords = [
-        'hospital', 'clinic', 'medical', 'doctor', 'physician', 'nurse',
-        'healthcare', 'health', 'pharmacy', 'laboratory', 'diagnostic'
-    ]
-
-    education_keywords = [
-        'school', 'university', 'college', 'institute', 'academy', 'education',
-        'training', 'learning', 'teacher', 'professor', 'student'
-    ]
-
-    finance_keywords = [
-        'bank', 'banking', 'finance', 'financial', 'insurance', 'investment',
-        'accounting', 'audit', 'tax', 'credit', 'loan', 'mortgage'
-    ]
-
-    # 4. General Categories
-    personal_keywords = [
-        'home', 'personal', 'friend', 'family', 'neighbor', 'buddy', 'mate',
-        'college', 'school', 'university', 'gym', 'club', 'hobby', 'social',
-        'residential', 'apartment', 'house', 'street', 'lane', 'avenue',
-        'sister', 'brother', 'cousin', 'relative', 'gmail', 'yahoo', 'hotmail'
-    ]
-
-    # Priority-based categorization logic
-    # Check most specific categories first
-
-    # Diplomatic & Government (Highest Priority)
-    if any(keyword in all_text for keyword in high_commissioner_keywords):
-        return "High Commissioner"
-    elif any(keyword in all_text for keyword in embassy_keywords):
-        return "Embassy"
-    elif any(keyword in all_text for keyword in consulate_keywords):
-        return "Consulate"
-    elif any(keyword in all_text for keyword in government_keywords):
-        return "Government"
-
-    # Business & Trade Categories
-    elif any(keyword in all_text for keyword in association_keywords):
-        return "Association"
-    elif any(keyword in all_text for keyword in exporter_keywords):
-        return "Exporter"
-    elif any(keyword in all_text for keyword in importer_keywords):
-        return "Importer"
-    elif any(keyword in all_text for keyword in logistics_keywords):
-        return "Logistics"
-    elif any(keyword in all_text for keyword in event_management_keywords):
-        return "Event Management"
-    elif any(keyword in all_text for keyword in consultancy_keywords):
-        return "Consultancy"
-    elif any(keyword in all_text for keyword in manufacturer_keywords):
-        return "Manufacturer"
-    elif any(keyword in all_text for keyword in distributor_keywords):
-        return "Distributor"
-    elif any(keyword in all_text for keyword in producer_keywords):
-        return "Producer"
-
-    # Specialized Service Categories
-    elif any(keyword in all_text for keyword in healthcare_keywords):
-        return "Healthcare"
-    elif any(keyword in all_text for keyword in education_keywords):
-        return "Education"
-    elif any(keyword in all_text for keyword in finance_keywords):
-        return "Finance"
+def _category_for(priority, email):
+    """Map a keyword priority and the contact's email to its category"""
+    if priority is not None and priority < PERSONAL_PRIORITY:
+        return CATEGORY_KEYWORDS[priority][0]
 
     # Email domain analysis for general categories
     elif email:
         domain = email.split('@')[-1] if '@' in email else ''
-        if any(gov_domain in domain for gov_domain in ['.gov', 'government', 'ministry']):
-            return "Government"
-        elif any(edu_domain in domain for edu_domain in ['.edu', '.ac.', 'university', 'college']):
-            return "Education"
-        elif any(personal_domain in domain for personal_domain in ['gmail', 'yahoo', 'hotmail', 'outlook']):
-            return "Personal"
-        elif any(biz_domain in domain for biz_domain in ['company', 'corp', 'business', 'enterprise', '.org']):
-            return "Business"
+        for category, fragments in EMAIL_DOMAIN_CATEGORIES:
+            if any(fragment in domain for fragment in fragments):
+                return category
 
     # Personal category check
-    elif any(keyword in all_text for keyword in personal_keywords):
+    elif priority == PERSONAL_PRIORITY:
         return "Personal"
 
     # Default fallback
     else:
-        return "Others"
\ No newline at end of file
+        return "Others"
+
+def categorize_contact(contact):
+    """Enhanced contact categorization with specialized categories"""
+    all_text, email = _contact_text(contact)
+
+    # Priority-based categorization: one pass over the text finds the most
+    # specific category with a matching keyword
+    return _category_for(_match_priority(all_text), email)
+
+# Joins contact texts for the bulk sweep; no keyword contains it, so a
+# match never spans two contacts
+CONTACT_SEPARATOR = '\0'
+
+def categorize_contacts(contacts):
+    """Categorize a list of contacts with one automaton sweep over all of their text"""
+    if not contacts:
+        return []
+    if not AHOCORASICK_AVAILABLE:
+        return [categorize_contact(contact) for contact in contacts]
+
+    texts, emails = zip(*map(_contact_text, contacts))
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + len(CONTACT_SEPARATOR)
+
+    priorities = [None] * len(texts)
+    for end_index, priority in _get_keyword_automaton().iter(CONTACT_SEPARATOR.join(texts)):
+        row = bisect.bisect_right(starts, end_index) - 1
+        if priorities[row] is None or priority < priorities[row]:
+            priorities[row] = priority
+
+    return [_category_for(priority, email) for priority, email in zip(priorities, emails)]
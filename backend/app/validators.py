@@ -2,13 +2,15 @@ import re
 from typing import Optional
 from app.exceptions import ValidationError
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+NON_DIGIT_PATTERN = re.compile(r'\D')
+
 def validate_email(email: Optional[str]) -> Optional[str]:
     """Validate email format"""
     if not email:
         return email
     
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email):
+    if not EMAIL_PATTERN.match(email):
         raise ValidationError("email", "Invalid email format")
     return email
 
@@ -19,7 +21,7 @@ def validate_phone(phone: Optional[str]) -> Optional[str]:
 
     # Allow more flexible phone formats for international numbers
     # Remove all non-alphanumeric characters except + and -
-    cleaned_phone = re.sub(r'\D', '', phone)
+    cleaned_phone = NON_DIGIT_PATTERN.sub('', phone)
 
     # Check if it's a valid length (7-20 digits for international flexibility)
     if cleaned_phone and (len(cleaned_phone) < 7 or len(cleaned_phone) > 20):
@@ -50,7 +52,7 @@ def validate_file_type(filename: str, allowed_types: list = None) -> str:
     if not filename:
         raise ValidationError("file", "Filename is required")
     
-    file_extension = filename.split('.')[-1].lower()
+    file_extension = filename.rpartition('.')[2].lower()
     if file_extension not in allowed_types:
         raise ValidationError("file", f"File type '{file_extension}' not supported. Allowed types: {', '.join(allowed_types)}")
     
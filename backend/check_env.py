@@ -4,8 +4,11 @@ Check environment variables for LLM configuration
 """
 import os
 
-def check_environment():
-    """Check all relevant environment variables"""
+def check_environment(env=None):
+    """Check all relevant environment variables (from os.environ unless env is given)"""
+    # Read from one snapshot instead of looking each variable up in os.environ
+    env = dict(os.environ) if env is None else env
+
     print("🔍 Environment Variable Check")
     print("=" * 40)
     
@@ -24,7 +27,7 @@ def check_environment():
     found_keys = 0
     
     for var_name, description in env_vars:
-        value = os.getenv(var_name)
+        value = env.get(var_name)
         if value:
             if "API_KEY" in var_name:
                 # Mask API keys for security
@@ -45,12 +48,12 @@ def check_environment():
         print("⚠️ No LLM providers configured - using SpaCy fallback only")
     
     # Check specific Groq configuration
-    groq_key = os.getenv("GROQ_API_KEY")
+    groq_key = env.get("GROQ_API_KEY")
     if groq_key:
         print(f"\n🤖 Groq Configuration:")
         print(f"   Key format: {'✅ Valid' if groq_key.startswith('gsk_') else '❌ Invalid'}")
         print(f"   Key length: {len(groq_key)} characters")
-        print(f"   Model: {os.getenv('GROQ_MODEL', 'mixtral-8x7b-32768')}")
+        print(f"   Model: {env.get('GROQ_MODEL', 'mixtral-8x7b-32768')}")
     
     return found_keys > 0
 
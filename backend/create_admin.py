@@ -1,43 +1,59 @@
 
 import os
 import sys
+from sqlalchemy import exists
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-try:
-    from app.database import SessionLocal
-    from app.models.user import User, UserRole
-    from app.auth.security import get_password_hash
-except ImportError:
-    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+INSERT_CONSTRUCTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def create_admin(env=None):
+    # Imported here so importing this module does not load the app, passlib or bcrypt
     from app.database import SessionLocal
     from app.models.user import User, UserRole
     from app.auth.security import get_password_hash
 
-ADMIN_USERNAME = os.getenv('ADMIN_USERNAME', 'admin')
-ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@example.com')
-ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
-
+    env = os.environ if env is None else env
+    admin_username = env.get('ADMIN_USERNAME', 'admin')
+    admin_email = env.get('ADMIN_EMAIL', 'admin@example.com')
+    admin_password = env.get('ADMIN_PASSWORD', 'admin123')
 
-def create_admin():
     db: Session = SessionLocal()
     try:
-        user = db.query(User).filter(User.username == ADMIN_USERNAME).first()
-        if user:
-            print(f"Admin user '{ADMIN_USERNAME}' already exists.")
+        # bcrypt is deliberately slow, so look first and hash only when the admin is missing
+        if db.query(exists().where(User.username == admin_username)).scalar():
+            print(f"Admin user '{admin_username}' already exists.")
             return
-        admin_user = User(
-            username=ADMIN_USERNAME,
-            email=ADMIN_EMAIL,
-            hashed_password=get_password_hash(ADMIN_PASSWORD),
+        admin_values = dict(
+            username=admin_username,
+            email=admin_email,
+            hashed_password=get_password_hash(admin_password),
             full_name='Administrator',
             role=UserRole.ADMIN,
             is_active=True,
             is_verified=True
         )
-        db.add(admin_user)
+        insert = INSERT_CONSTRUCTS.get(db.get_bind().dialect.name)
+        if insert is None:
+            db.add(User(**admin_values))
+            created = True
+        else:
+            # A concurrent run may have created it since the check; skip instead of failing
+            result = db.execute(
+                insert(User).values(**admin_values)
+                .on_conflict_do_nothing(index_elements=["username"])
+            )
+            created = result.rowcount == 1
         db.commit()
-        print(f"Admin user '{ADMIN_USERNAME}' created successfully.")
+        if created:
+            print(f"Admin user '{admin_username}' created successfully.")
+        else:
+            print(f"Admin user '{admin_username}' already exists.")
     finally:
         db.close()
 
 if __name__ == "__main__":
+    sys.path.append(os.path.abspath(os.path.dirname(__file__)))
     create_admin()
@@ -0,0 +1,119 @@
+"""
+Disk cache of Content Intelligence results for the test scripts, keyed by LLM provider,
+model, input text and the Content Intelligence source
+"""
+import os
+import time
+import hashlib
+import logging
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+from pydantic import BaseModel, ConfigDict, ValidationError
+from app.services import content_intelligence as content_intelligence_module
+from app.services.content_intelligence import content_intelligence
+
+logger = logging.getLogger(__name__)
+
+# Bump when the shape of cached entries changes; prompt and code changes in
+# content_intelligence.py are picked up through its source digest
+EXTRACTION_CACHE_VERSION = 1
+CONTENT_INTELLIGENCE_DIGEST = hashlib.sha256(Path(content_intelligence_module.__file__).read_bytes()).hexdigest()
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", os.path.join(tempfile.gettempdir(), "extraction_cache"))
+
+class CachedAnalysis(BaseModel):
+    success: bool
+    contacts: List[Dict[str, Any]]
+    analysis: Dict[str, Any]
+
+    model_config = ConfigDict(extra="allow")
+
+class CachedExtraction(BaseModel):
+    version: int
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    cached_at: datetime
+    result: CachedAnalysis
+
+def _cache_key(*parts: str) -> str:
+    """sha256 over length-prefixed parts, so no two part lists share a key"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode()
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+def _load(path: str, max_age_seconds: Optional[float]) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    if max_age_seconds is not None and time.time() - os.path.getmtime(path) >= max_age_seconds:
+        return None
+    try:
+        with open(path) as f:
+            entry = CachedExtraction.model_validate_json(f.read())
+    except (OSError, ValidationError) as e:
+        logger.warning(f"Evicting unreadable extraction cache entry {path}: {e}")
+        os.remove(path)
+        return None
+    if entry.version != EXTRACTION_CACHE_VERSION:
+        os.remove(path)
+        return None
+    return entry.result.model_dump()
+
+def _store(path: str, provider: Optional[str], model: Optional[str], result: Dict[str, Any]) -> None:
+    try:
+        data = CachedExtraction(
+            version=EXTRACTION_CACHE_VERSION,
+            provider=provider,
+            model=model,
+            cached_at=datetime.now(timezone.utc),
+            result=result
+        ).model_dump_json()
+    except ValueError as e:
+        logger.warning(f"Analysis result cannot be cached: {e}")
+        return
+    # Write then rename so concurrent runs never read a partial file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _is_llm_result(result: Dict[str, Any]) -> bool:
+    """
+    Whether the LLM answered; SpaCy-fallback results from a failed or missing
+    LLM call still report success, but must not be replayed
+    """
+    method = result.get("analysis", {}).get("llm_extraction", {}).get("method")
+    return bool(result.get("success")) and method not in (None, "llm_failed", "no_llm")
+
+async def cached_analyze(
+    text: str,
+    file_type: str = "text",
+    use_cache: bool = True,
+    max_age_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Run content_intelligence.analyze_content, reusing an earlier result for the
+    same text from the same provider and model when one is on disk
+    """
+    await content_intelligence.warmup()
+    provider = content_intelligence.default_provider
+    model = content_intelligence.llm_clients.get(provider, {}).get("model") if provider else None
+    key = _cache_key(
+        str(EXTRACTION_CACHE_VERSION), CONTENT_INTELLIGENCE_DIGEST, provider or "", model or "", file_type, text
+    )
+    path = os.path.join(EXTRACTION_CACHE_DIR, f"{key}.json")
+
+    if use_cache:
+        cached = _load(path, max_age_seconds)
+        if cached is not None:
+            logger.info(f"♻️ Using cached analysis ({provider or 'no LLM'}, {len(text)} characters)")
+            return cached
+
+    result = await content_intelligence.analyze_content(text, file_type)
+    if _is_llm_result(result):
+        _store(path, provider, model, result)
+    return result
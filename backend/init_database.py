@@ -6,7 +6,8 @@ import sys
 import os
 sys.path.append('.')
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import NullPool
 from app.models import Base
 from app.config import settings
 
@@ -15,10 +16,17 @@ def init_database():
     print("Initializing database with new schema...")
     
     # Create engine
-    engine = create_engine(settings.DATABASE_URL)
+    # One-shot script: connect once, keep no idle pooled connections
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # Create all tables in one transaction; on PostgreSQL a failure part way
+    # through rolls back every table and index instead of leaving half a schema
+    with engine.begin() as conn:
+        # One catalog query up front instead of an existence check per table
+        existing = set(inspect(conn).get_table_names())
+        to_create = [table for name, table in Base.metadata.tables.items() if name not in existing]
+        if to_create:
+            Base.metadata.create_all(bind=conn, tables=to_create)
     
     print("Database initialized successfully!")
     print(f"   Database URL: {settings.DATABASE_URL}")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Shared LLM provider calls for the LLM debug scripts
+"""
+import asyncio
+import atexit
+import logging
+import os
+import queue
+import time
+from importlib.util import find_spec
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import httpx
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Providers the debug scripts call, in reporting order
+PROVIDERS = [
+    {
+        "name": "groq",
+        "label": "Groq",
+        "env": "GROQ_API_KEY",
+        "key": os.getenv("GROQ_API_KEY"),
+        "base_url": "https://api.groq.com/openai/v1",
+        "model": "mixtral-8x7b-32768",
+        "requests_per_minute": 30,
+        "tokens_per_minute": 5000,
+    },
+    {
+        "name": "openai",
+        "label": "OpenAI",
+        "env": "OPENAI_API_KEY",
+        "key": os.getenv("OPENAI_API_KEY"),
+        "base_url": None,
+        "model": "gpt-3.5-turbo",
+        "requests_per_minute": 3500,
+        "tokens_per_minute": 60000,
+    },
+]
+
+# One pooled HTTP client shared by every provider client
+_HTTP_CLIENT = None
+
+# One AsyncOpenAI client per provider name, reused by every request
+_CLIENTS = {}
+
+
+class RateLimiter:
+    """Token bucket over requests and tokens per minute, corrected by the provider's rate-limit headers"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_requests = requests_per_minute
+        self.available_tokens = tokens_per_minute
+        self.last_update = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.available_requests = min(
+            self.requests_per_minute,
+            self.available_requests + elapsed * self.requests_per_minute / 60
+        )
+        self.available_tokens = min(
+            self.tokens_per_minute,
+            self.available_tokens + elapsed * self.tokens_per_minute / 60
+        )
+
+    async def acquire(self, estimated_tokens):
+        """Wait until one request and estimated_tokens fit in the bucket, then take them"""
+        estimated_tokens = min(estimated_tokens, self.tokens_per_minute)
+        while True:
+            self._refill()
+            if self.available_requests >= 1 and self.available_tokens >= estimated_tokens:
+                self.available_requests -= 1
+                self.available_tokens -= estimated_tokens
+                return
+            # Sleep just long enough for the scarcer of the two to refill
+            request_wait = (1 - self.available_requests) * 60 / self.requests_per_minute
+            token_wait = (estimated_tokens - self.available_tokens) * 60 / self.tokens_per_minute
+            await asyncio.sleep(max(request_wait, token_wait, 0.01))
+
+    def update(self, headers):
+        """Lower the bucket to the remaining capacity the provider reports, if any"""
+        self._refill()
+        for header, attr in (("x-ratelimit-remaining-requests", "available_requests"),
+                             ("x-ratelimit-remaining-tokens", "available_tokens")):
+            try:
+                remaining = float(headers[header])
+            except (KeyError, TypeError, ValueError):
+                continue
+            setattr(self, attr, min(getattr(self, attr), remaining))
+
+
+_LIMITERS = {
+    cfg["name"]: RateLimiter(cfg["requests_per_minute"], cfg["tokens_per_minute"])
+    for cfg in PROVIDERS
+}
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue records as-is so the listener thread does all the formatting"""
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging():
+    """Log through a queue so tracebacks are formatted and written off the event loop"""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flushes queued records on exit
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), handlers=[_DeferredQueueHandler(log_queue)])
+
+def available_providers():
+    """Return the providers that have an API key set"""
+    return [cfg for cfg in PROVIDERS if cfg["key"]]
+
+async def _log_http_version(response):
+    logger.debug("%s %s answered over %s", response.request.method, response.request.url.host, response.http_version)
+
+def get_http_client():
+    """Return the shared httpx.AsyncClient, creating it on first use"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            # Multiplex concurrent calls to one host over a single connection when h2 is installed
+            http2=find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            event_hooks={"response": [_log_http_version]},
+        )
+    return _HTTP_CLIENT
+
+def get_client(cfg):
+    """Return the provider's AsyncOpenAI client, creating it on first use"""
+    client = _CLIENTS.get(cfg["name"])
+    if client is None:
+        client = openai.AsyncOpenAI(api_key=cfg["key"], base_url=cfg["base_url"], http_client=get_http_client())
+        _CLIENTS[cfg["name"]] = client
+    return client
+
+async def close_http_client():
+    """Close the shared HTTP client if one was opened"""
+    global _HTTP_CLIENT
+    # The provider clients all wrap it, so they go with it
+    _CLIENTS.clear()
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+async def _prepare_request(cfg, prompt, max_tokens, temperature, system, response_format):
+    """Wait for rate-limit capacity, then return the provider client and create() arguments"""
+    if not OPENAI_AVAILABLE:
+        raise RuntimeError("openai and httpx must be installed to call LLM providers")
+
+    # Fixed instructions go first so repeated requests share a cacheable prefix
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+
+    # Throttle up front instead of waiting out 429s; roughly 4 characters per prompt token
+    limiter = _LIMITERS[cfg["name"]]
+    await limiter.acquire((len(system or "") + len(prompt)) // 4 + max_tokens)
+
+    client = get_client(cfg)
+    kwargs = dict(model=cfg["model"], messages=messages, max_tokens=max_tokens, temperature=temperature)
+    if response_format:
+        kwargs["response_format"] = response_format
+    return client, limiter, kwargs
+
+async def call_llm(cfg, prompt, max_tokens=1000, temperature=0.1, system=None, response_format=None):
+    """Send prompt as the user message to the provider described by cfg, after an optional system message"""
+    client, limiter, kwargs = await _prepare_request(cfg, prompt, max_tokens, temperature, system, response_format)
+    raw_response = await client.chat.completions.with_raw_response.create(**kwargs)
+    limiter.update(raw_response.headers)
+    return raw_response.parse()
+
+async def stream_llm(cfg, prompt, max_tokens=1000, temperature=0.1, system=None, response_format=None):
+    """Like call_llm, but return an async stream of completion chunks as they are generated"""
+    client, _, kwargs = await _prepare_request(cfg, prompt, max_tokens, temperature, system, response_format)
+    return await client.chat.completions.create(stream=True, **kwargs)
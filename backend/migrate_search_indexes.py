@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Add the search columns and indexes to an existing contacts table
+"""
+import sys
+sys.path.append('.')
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from app.models import Contact, SEARCH_BLOB_COLUMNS, SEARCH_BLOB_DDL, SEARCH_VECTOR_DDL
+from app.config import settings
+
+def migrate_search_indexes():
+    """Create the search_blob/search_vector columns and search indexes if missing"""
+    # One-shot script: connect once, keep no idle pooled connections
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+
+    # Other databases match search terms inline and need no extra columns
+    if engine.dialect.name != "postgresql":
+        print(f"Skipping search index migration for {engine.dialect.name} database")
+        return
+
+    print("Creating search indexes...")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for index in Contact.__table__.indexes:
+            index.create(conn, checkfirst=True)
+            print(f"   - {index.name}")
+        for statement in SEARCH_BLOB_DDL + SEARCH_VECTOR_DDL:
+            conn.execute(text(statement))
+        print("   - search_blob (contacts_search_blob_trgm)")
+        print("   - search_vector (contacts_fts)")
+
+        # Per-column trigram indexes from earlier versions, superseded by search_blob
+        for column in SEARCH_BLOB_COLUMNS:
+            conn.execute(text(f"DROP INDEX IF EXISTS contacts_{column}_trgm"))
+
+    print("Search indexes ready!")
+
+if __name__ == "__main__":
+    migrate_search_indexes()
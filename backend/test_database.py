@@ -2,12 +2,43 @@
 """
 Test script to verify database operations
 """
+import asyncio
+import logging
 import sys
 import os
+from contextlib import closing
 from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+# Rows per INSERT batch in the upload simulation
+UPLOAD_BATCH_SIZE = 500
 
 # Add the backend directory to the path
-sys.path.append('/home/yuthar/contact-management-system/backend')
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+logger = logging.getLogger(__name__)
+
+# Table names per database URL, so repeated checks skip the catalog query
+_TABLE_NAMES = {}
+
+def table_names(engine):
+    """Return the engine's table names, reflecting them only on the first call"""
+    from sqlalchemy import inspect
+    
+    key = str(engine.url)
+    if key not in _TABLE_NAMES:
+        _TABLE_NAMES[key] = inspect(engine).get_table_names()
+    return _TABLE_NAMES[key]
+
+def iter_contacts(db, batch=100):
+    """Yield contacts newest first, fetched in batches through a server-side cursor"""
+    from sqlalchemy import select
+    from api import Contact
+    
+    stmt = select(Contact).execution_options(stream_results=True).order_by(Contact.id.desc())
+    yield from db.scalars(stmt).yield_per(batch)
 
 def test_database_connection():
     """Test database connection and basic operations"""
@@ -20,74 +51,85 @@ def test_database_connection():
         sys.path.append('.')
         from api import Contact, Base
         
-        # Test database connection
-        print("📊 Testing database connection...")
-        db = SessionLocal()
-        
         # Check if tables exist
         print("📋 Checking database tables...")
-        from sqlalchemy import inspect
-        inspector = inspect(engine)
-        tables = inspector.get_table_names()
+        tables = table_names(engine)
         print(f"📊 Available tables: {tables}")
         
         if 'contacts' not in tables:
             print("⚠️ Contacts table not found, creating tables...")
             Base.metadata.create_all(bind=engine)
+            _TABLE_NAMES.pop(str(engine.url), None)  # Schema changed, reflect again next time
             print("✅ Tables created")
         
-        # Count existing contacts
-        contact_count = db.query(Contact).count()
-        print(f"📊 Current contacts in database: {contact_count}")
-        
-        # List recent contacts
-        recent_contacts = db.query(Contact).order_by(Contact.id.desc()).limit(5).all()
-        if recent_contacts:
-            print("📋 Recent contacts:")
-            for contact in recent_contacts:
-                print(f"   ID: {contact.id} | {contact.name} | {contact.email} | {contact.phone}")
-        else:
-            print("📋 No contacts found in database")
-        
-        # Test creating a contact
-        print("\n🧪 Testing contact creation...")
-        test_contact = Contact(
-            name="Test Contact",
-            designation="Test Engineer",
-            company="Test Company",
-            email="test@example.com",
-            phone="+1-555-TEST",
-            website="",
-            address="Test Address",
-            category="Others",  # Fixed: use 'category' not 'categories'
-            notes=""
-        )
-        
-        db.add(test_contact)
-        db.commit()
-        print("✅ Test contact created successfully")
-        
-        # Verify the contact was saved
-        saved_contact = db.query(Contact).filter(Contact.email == "test@example.com").first()
-        if saved_contact:
-            print(f"✅ Test contact verified: {saved_contact.name} - {saved_contact.email}")
+        # Test database connection; everything below runs in one transaction
+        # that commits once when the block exits
+        print("📊 Testing database connection...")
+        with SessionLocal.begin() as db:
+            # Count existing contacts
+            contact_count = db.query(Contact).count()
+            print(f"📊 Current contacts in database: {contact_count}")
             
-            # Clean up test contact
-            db.delete(saved_contact)
-            db.commit()
-            print("🧹 Test contact cleaned up")
-        else:
-            print("❌ Test contact not found after creation")
+            # List recent contacts
+            with closing(iter_contacts(db, batch=5)) as contacts:
+                recent_contacts = list(islice(contacts, 5))
+            if recent_contacts:
+                print("📋 Recent contacts:")
+                for contact in recent_contacts:
+                    print(f"   ID: {contact.id} | {contact.name} | {contact.email} | {contact.phone}")
+            else:
+                print("📋 No contacts found in database")
+            
+            # Test creating a contact
+            print("\n🧪 Testing contact creation...")
+            test_contact = Contact(
+                name="Test Contact",
+                designation="Test Engineer",
+                company="Test Company",
+                email="test@example.com",
+                phone="+1-555-TEST",
+                website="",
+                address="Test Address",
+                category="Others",  # Fixed: use 'category' not 'categories'
+                notes=""
+            )
+            
+            db.add(test_contact)
+            db.flush()  # Assigns the id without committing
+            print("✅ Test contact created successfully")
+            
+            # Verify the contact was saved
+            saved_contact = db.get(Contact, test_contact.id)
+            if saved_contact:
+                print(f"✅ Test contact verified: {saved_contact.name} - {saved_contact.email}")
+                
+                # Clean up test contact
+                db.delete(saved_contact)
+                print("🧹 Test contact cleaned up")
+            else:
+                print("❌ Test contact not found after creation")
         
-        db.close()
         return True
         
     except Exception as e:
         print(f"❌ Database test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Database test failed")
         return False
 
+def contact_row(contact_data, notes):
+    """Map an analyzed contact onto Contact column values"""
+    return {
+        "name": contact_data.get("name", ""),
+        "designation": contact_data.get("designation", ""),
+        "company": contact_data.get("company", ""),
+        "email": contact_data.get("email", ""),
+        "phone": contact_data.get("phone", ""),
+        "website": contact_data.get("website", ""),
+        "address": contact_data.get("address", ""),
+        "category": contact_data.get("category", "Others"),  # Normalized by analyze_content
+        "notes": notes
+    }
+
 def test_upload_simulation():
     """Simulate the upload process to see where it fails"""
     try:
@@ -97,7 +139,7 @@ def test_upload_simulation():
         # Import Contact from api.py where it's actually defined
         from api import Contact
         from app.services.content_intelligence import content_intelligence
-        import asyncio
+        from sqlalchemy import insert
         
         # Simulate extracted text from OCR
         test_text = """
@@ -114,57 +156,35 @@ def test_upload_simulation():
         print(f"📝 Simulating Content Intelligence analysis...")
         
         # Run Content Intelligence analysis
-        async def run_analysis():
-            return await content_intelligence.analyze_content(test_text, "text")
-        
-        analysis_result = asyncio.run(run_analysis())
+        analysis_result = asyncio.run(content_intelligence.analyze_content(test_text, "text"))
         
         print(f"📊 Analysis success: {analysis_result['success']}")
         print(f"📊 Contacts found: {len(analysis_result['contacts'])}")
         
         if analysis_result['contacts']:
-            contact_data = analysis_result['contacts'][0]
-            print(f"👤 First contact: {contact_data}")
+            print(f"👤 First contact: {analysis_result['contacts'][0]}")
             
             # Test database insertion
             print("\n💾 Testing database insertion...")
             db = SessionLocal()
             
-            # Fix categories field mapping
-            categories = contact_data.get("categories", ["Others"])
-            if isinstance(categories, list):
-                category_str = categories[0] if categories else "Others"
-            else:
-                category_str = str(categories) if categories else "Others"
-            
-            # Create contact with correct field mapping
-            db_contact_data = {
-                "name": contact_data.get("name", ""),
-                "designation": contact_data.get("designation", ""),
-                "company": contact_data.get("company", ""),
-                "email": contact_data.get("email", ""),
-                "phone": contact_data.get("phone", ""),
-                "website": contact_data.get("website", ""),
-                "address": contact_data.get("address", ""),
-                "category": category_str,  # Fixed: use 'category' not 'categories'
-                "notes": f"Test upload - {datetime.now().isoformat()}"
-            }
+            # Tag this run's rows so they can be found again
+            upload_note = f"Test upload - {datetime.now().isoformat()}"
+            rows = (contact_row(contact_data, upload_note) for contact_data in analysis_result['contacts'])
+            print(f"💾 Creating {len(analysis_result['contacts'])} contact(s), first: {analysis_result['contacts'][0]}")
             
-            print(f"💾 Creating contact with data: {db_contact_data}")
+            # Insert in batches inside one transaction, like a real multi-contact upload
+            with db.begin():
+                for batch in iter(lambda: list(islice(rows, UPLOAD_BATCH_SIZE)), []):
+                    db.execute(insert(Contact), batch)
             
-            db_contact = Contact(**db_contact_data)
-            db.add(db_contact)
-            db.commit()
-            
-            print(f"✅ Contact created with ID: {db_contact.id}")
-            
-            # Verify it's in the database
-            saved_contact = db.query(Contact).filter(Contact.id == db_contact.id).first()
-            if saved_contact:
-                print(f"✅ Contact verified in database: {saved_contact.name}")
+            # Verify they're in the database
+            saved_count = db.query(Contact).filter(Contact.notes == upload_note).count()
+            if saved_count == len(analysis_result['contacts']):
+                print(f"✅ {saved_count} contact(s) verified in database")
                 print(f"📊 Total contacts now: {db.query(Contact).count()}")
             else:
-                print("❌ Contact not found after creation")
+                print(f"❌ Only {saved_count} of {len(analysis_result['contacts'])} contacts found after creation")
             
             db.close()
             return True
@@ -174,8 +194,7 @@ def test_upload_simulation():
             
     except Exception as e:
         print(f"❌ Upload simulation failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Upload simulation failed")
         return False
 
 def main():
@@ -4,6 +4,17 @@ Test frontend response format compatibility
 """
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dump_json(data):
+    """Pretty-print JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
 def test_response_format():
     """Test the response format that frontend expects"""
     
@@ -29,10 +40,10 @@ def test_response_format():
     }
     
     print("✅ Success Response Format:")
-    print(json.dumps(success_response, indent=2))
+    print(dump_json(success_response))
     
     print("\n❌ Error Response Format:")
-    print(json.dumps(error_response, indent=2))
+    print(dump_json(error_response))
     
     print("\n🔍 Frontend Compatibility Check:")
     print(f"   Has 'message': {'✅' if 'message' in success_response else '❌'}")
@@ -3,12 +3,37 @@
 Specific test to debug and fix Groq LLM empty response issue
 """
 import asyncio
+import logging
 import os
 import sys
 import json
+from importlib.util import find_spec
+from pathlib import Path
 
 # Add the backend directory to the path
-sys.path.append('/home/yuthar/contact-management-system/backend')
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+logger = logging.getLogger(__name__)
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+# Shared by every test call so they reuse one connection pool
+_GROQ = None
+
+def get_groq_client(api_key):
+    """Return the module-wide Groq client, creating it on first use"""
+    global _GROQ
+    if _GROQ is None:
+        import httpx
+        import openai
+        
+        http_client = httpx.Client(
+            http2=find_spec("h2") is not None,  # Multiplex the calls when h2 is installed
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=10),
+        )
+        _GROQ = openai.OpenAI(api_key=api_key, base_url=GROQ_BASE_URL, http_client=http_client)
+    return _GROQ
 
 async def test_groq_directly():
     """Test Groq API directly with the exact same text from OCR"""
@@ -40,102 +65,110 @@ async def test_groq_directly():
         
         print(f"📝 Testing with OCR text ({len(ocr_text)} characters)")
         
-        import openai
-        
-        client = openai.OpenAI(
-            api_key=groq_key,
-            base_url="https://api.groq.com/openai/v1"
-        )
+        client = get_groq_client(groq_key)
         
-        # Test 1: Simple prompt
-        print("\n🧪 Test 1: Simple prompt")
         simple_prompt = f"""Extract contact info as JSON:
 
 {ocr_text}
 
 Return: [{{"name":"","email":"","phone":"","company":"","categories":["Others"]}}]"""
+        ultra_simple = "Extract name and email from: John Doe john.doe@techsolutions.com"
         
-        try:
-            response1 = await asyncio.to_thread(
+        if "--batched" in sys.argv:
+            return await test_groq_batched(client, [simple_prompt, ultra_simple])
+        
+        # The three calls are independent, so send them concurrently
+        tests = [
+            ("Test 1: Simple prompt", "mixtral-8x7b-32768", simple_prompt, 1000),
+            ("Test 2: Ultra-simple prompt", "mixtral-8x7b-32768", ultra_simple, 500),
+            ("Test 3: Different Groq model", "llama3-8b-8192", ultra_simple, 500),
+        ]
+        print(f"\n🧪 Sending {len(tests)} test requests concurrently...")
+        responses = await asyncio.gather(
+            *(asyncio.to_thread(
                 client.chat.completions.create,
-                model="mixtral-8x7b-32768",
-                messages=[{"role": "user", "content": simple_prompt}],
-                max_tokens=1000,
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
                 temperature=0.0
-            )
+            ) for _, model, prompt, max_tokens in tests),
+            return_exceptions=True,
+        )
+        
+        for number, ((title, _, _, _), response) in enumerate(zip(tests, responses), start=1):
+            print(f"\n🧪 {title}")
+            if isinstance(response, Exception):
+                print(f"❌ Test {number} API call failed: {response}")
+                continue
             
-            result1 = response1.choices[0].message.content
-            print(f"📥 Response 1 length: {len(result1) if result1 else 0}")
-            print(f"📥 Response 1 content: {repr(result1)}")
+            result = response.choices[0].message.content
+            print(f"📥 Response {number} length: {len(result) if result else 0}")
+            print(f"📥 Response {number} content: {repr(result)}")
             
-            if result1 and result1.strip():
+            if not (result and result.strip()):
+                suffix = " with different model" if number == 3 else ""
+                print(f"❌ Test {number} FAILED: Empty response{suffix}")
+            elif number == 1:
                 try:
-                    contacts1 = json.loads(result1.strip())
+                    contacts1 = json.loads(result.strip())
                     print(f"✅ Test 1 SUCCESS: {len(contacts1)} contacts parsed")
                 except json.JSONDecodeError as e:
                     print(f"❌ Test 1 JSON parsing failed: {e}")
-            else:
-                print("❌ Test 1 FAILED: Empty response")
-                
-        except Exception as e:
-            print(f"❌ Test 1 API call failed: {e}")
-        
-        # Test 2: Even simpler prompt
-        print("\n🧪 Test 2: Ultra-simple prompt")
-        ultra_simple = "Extract name and email from: John Doe john.doe@techsolutions.com"
-        
-        try:
-            response2 = await asyncio.to_thread(
-                client.chat.completions.create,
-                model="mixtral-8x7b-32768",
-                messages=[{"role": "user", "content": ultra_simple}],
-                max_tokens=500,
-                temperature=0.0
-            )
-            
-            result2 = response2.choices[0].message.content
-            print(f"📥 Response 2 length: {len(result2) if result2 else 0}")
-            print(f"📥 Response 2 content: {repr(result2)}")
-            
-            if result2 and result2.strip():
+            elif number == 2:
                 print(f"✅ Test 2 SUCCESS: Got response")
             else:
-                print("❌ Test 2 FAILED: Empty response")
-                
-        except Exception as e:
-            print(f"❌ Test 2 API call failed: {e}")
-        
-        # Test 3: Different model
-        print("\n🧪 Test 3: Different Groq model")
-        try:
-            response3 = await asyncio.to_thread(
-                client.chat.completions.create,
-                model="llama3-8b-8192",  # Different model
-                messages=[{"role": "user", "content": ultra_simple}],
-                max_tokens=500,
-                temperature=0.0
-            )
-            
-            result3 = response3.choices[0].message.content
-            print(f"📥 Response 3 length: {len(result3) if result3 else 0}")
-            print(f"📥 Response 3 content: {repr(result3)}")
-            
-            if result3 and result3.strip():
                 print(f"✅ Test 3 SUCCESS: Different model works")
                 return True
-            else:
-                print("❌ Test 3 FAILED: Empty response with different model")
-                
-        except Exception as e:
-            print(f"❌ Test 3 API call failed: {e}")
         
         return False
         
     except Exception as e:
         print(f"❌ Groq test crashed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Groq test crashed")
+        return False
+
+async def test_groq_batched(client, prompts, model="llama3-8b-8192"):
+    """Send every prompt in one JSON-mode request and check each numbered answer"""
+    print(f"\n🧪 Batched test: {len(prompts)} prompts in one {model} request")
+    tasks = "\n\n".join(f"Task {number}:\n{prompt}" for number, prompt in enumerate(prompts, start=1))
+    batched_prompt = (
+        "Perform each task below. Return a JSON object whose keys are the task numbers "
+        f'("1" to "{len(prompts)}") and whose values are the answers.\n\n{tasks}'
+    )
+    
+    try:
+        response = await asyncio.to_thread(
+            client.chat.completions.create,
+            model=model,
+            messages=[{"role": "user", "content": batched_prompt}],
+            response_format={"type": "json_object"},
+            max_tokens=1500,
+            temperature=0.0
+        )
+    except Exception as e:
+        print(f"❌ Batched API call failed: {e}")
         return False
+    
+    result = response.choices[0].message.content
+    print(f"📥 Batched response length: {len(result) if result else 0}")
+    try:
+        answers = json.loads(result or "")
+    except json.JSONDecodeError as e:
+        print(f"❌ Batched JSON parsing failed: {e}")
+        return False
+    if not isinstance(answers, dict):
+        print(f"❌ Batched response is not a JSON object: {repr(result)[:200]}")
+        return False
+    
+    passed = True
+    for number in range(1, len(prompts) + 1):
+        answer = answers.get(str(number))
+        if answer:
+            print(f"✅ Task {number}: {json.dumps(answer)[:200]}")
+        else:
+            print(f"❌ Task {number}: Empty answer")
+            passed = False
+    return passed
 
 async def test_content_intelligence_with_debug():
     """Test Content Intelligence with enhanced debugging"""
@@ -145,7 +178,6 @@ async def test_content_intelligence_with_debug():
         from app.services.content_intelligence import content_intelligence
         
         # Enable debug logging
-        import logging
         logging.getLogger('app.services.content_intelligence').setLevel(logging.DEBUG)
         
         # Use the same OCR text
@@ -184,8 +216,7 @@ async def test_content_intelligence_with_debug():
         
     except Exception as e:
         print(f"❌ Content Intelligence test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Content Intelligence test failed")
         return False
 
 async def main():
@@ -3,12 +3,23 @@
 Debug script for LLM issues
 """
 import asyncio
-import os
+import logging
 import sys
 import json
+from pathlib import Path
 
 # Add the backend directory to the path
-sys.path.append('/home/yuthar/contact-management-system/backend')
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from llm_test_client import PROVIDERS, available_providers, call_llm, close_http_client, configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Fixed instructions, sent as the system message ahead of the text
+EXTRACTION_SYSTEM_PROMPT = """Extract contact information and return ONLY valid JSON array.
+
+Return JSON like: [{"name":"John Doe","designation":"Engineer","company":"ABC","email":"john@abc.com","phone":"+123","website":"","address":"","categories":["Others"]}]"""
 
 async def test_llm_directly():
     """Test LLM directly to debug the empty response issue"""
@@ -16,13 +27,11 @@ async def test_llm_directly():
         print("🔍 Testing LLM directly...")
         
         # Check environment variables
-        groq_key = os.getenv("GROQ_API_KEY")
-        openai_key = os.getenv("OPENAI_API_KEY")
-        
-        print(f"🔑 GROQ_API_KEY present: {bool(groq_key)}")
-        print(f"🔑 OPENAI_API_KEY present: {bool(openai_key)}")
+        for cfg in PROVIDERS:
+            print(f"🔑 {cfg['env']} present: {bool(cfg['key'])}")
         
-        if not groq_key and not openai_key:
+        providers = available_providers()
+        if not providers:
             print("❌ No API keys found in environment")
             return False
         
@@ -35,120 +44,56 @@ async def test_llm_directly():
         +1-555-123-4567
         """
         
-        # Try Groq if available
-        if groq_key:
-            print("\n🤖 Testing Groq API...")
-            try:
-                import openai
-                
-                client = openai.OpenAI(
-                    api_key=groq_key,
-                    base_url="https://api.groq.com/openai/v1"
-                )
-                
-                prompt = f"""Extract contact information and return ONLY valid JSON array.
-
-TEXT:
-{simple_text}
-
-Return JSON like: [{{"name":"John Doe","designation":"Engineer","company":"ABC","email":"john@abc.com","phone":"+123","website":"","address":"","categories":["Others"]}}]
-
-JSON:"""
-                
-                print(f"📝 Sending prompt (length: {len(prompt)})")
-                
-                response = await asyncio.to_thread(
-                    client.chat.completions.create,
-                    model="mixtral-8x7b-32768",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=1000,
-                    temperature=0.1
-                )
-                
-                result = response.choices[0].message.content
-                print(f"📥 Response length: {len(result) if result else 0}")
-                print(f"📥 Response content: {repr(result)}")
-                
-                if result and result.strip():
-                    try:
-                        contacts = json.loads(result.strip())
-                        print(f"✅ JSON parsing successful: {len(contacts)} contacts")
-                        print(f"📊 First contact: {contacts[0] if contacts else 'None'}")
-                        return True
-                    except json.JSONDecodeError as e:
-                        print(f"❌ JSON parsing failed: {e}")
-                        print(f"🔍 Trying to extract JSON from: {result}")
-                        return False
-                else:
-                    print("❌ Empty response from Groq")
-                    return False
-                    
-            except Exception as e:
-                print(f"❌ Groq test failed: {e}")
-                return False
-        
-        # Try OpenAI if available
-        if openai_key:
-            print("\n🤖 Testing OpenAI API...")
-            try:
-                import openai
-                
-                client = openai.OpenAI(api_key=openai_key)
-                
-                prompt = f"""Extract contact information and return ONLY valid JSON array.
-
-TEXT:
+        prompt = f"""TEXT:
 {simple_text}
 
-Return JSON like: [{{"name":"John Doe","designation":"Engineer","company":"ABC","email":"john@abc.com","phone":"+123","website":"","address":"","categories":["Others"]}}]
-
 JSON:"""
-                
-                response = await asyncio.to_thread(
-                    client.chat.completions.create,
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=1000,
-                    temperature=0.1
-                )
-                
-                result = response.choices[0].message.content
-                print(f"📥 Response length: {len(result) if result else 0}")
-                print(f"📥 Response content: {repr(result)}")
-                
-                if result and result.strip():
-                    try:
-                        contacts = json.loads(result.strip())
-                        print(f"✅ JSON parsing successful: {len(contacts)} contacts")
-                        return True
-                    except json.JSONDecodeError as e:
-                        print(f"❌ JSON parsing failed: {e}")
-                        return False
-                else:
-                    print("❌ Empty response from OpenAI")
-                    return False
-                    
-            except Exception as e:
-                print(f"❌ OpenAI test failed: {e}")
-                return False
-        
-        return False
         
-    except Exception as e:
-        print(f"❌ LLM test crashed: {e}")
-        import traceback
-        traceback.print_exc()
+        # Every configured provider gets the same prompt at once
+        print(f"\n📝 Sending prompt (length: {len(EXTRACTION_SYSTEM_PROMPT) + len(prompt)}) to {', '.join(cfg['label'] for cfg in providers)}")
+        responses = await asyncio.gather(
+            *(call_llm(cfg, prompt, system=EXTRACTION_SYSTEM_PROMPT) for cfg in providers),
+            return_exceptions=True,
+        )
+        
+        working = False
+        for cfg, response in zip(providers, responses):
+            label = cfg["label"]
+            print(f"\n🤖 {label} API")
+            if isinstance(response, Exception):
+                print(f"❌ {label} test failed: {response}")
+                continue
+            
+            result = response.choices[0].message.content
+            print(f"📥 Response length: {len(result) if result else 0}")
+            print(f"📥 Response content: {repr(result)}")
+            
+            if result and result.strip():
+                try:
+                    contacts = json.loads(result.strip())
+                    print(f"✅ JSON parsing successful: {len(contacts)} contacts")
+                    print(f"📊 First contact: {contacts[0] if contacts else 'None'}")
+                    working = True
+                except json.JSONDecodeError as e:
+                    print(f"❌ JSON parsing failed: {e}")
+                    print(f"🔍 Trying to extract JSON from: {result}")
+            else:
+                print(f"❌ Empty response from {label}")
+        
+        return working
+        
+    except Exception:
+        logger.exception("❌ LLM test crashed")
         return False
 
 async def test_content_intelligence_with_llm():
     """Test Content Intelligence with LLM debugging"""
     try:
-        from app.services.content_intelligence import content_intelligence
+        from extraction_cache import cached_analyze
         
         print("\n🧠 Testing Content Intelligence with LLM debugging...")
         
         # Enable debug logging
-        import logging
         logging.getLogger('app.services.content_intelligence').setLevel(logging.DEBUG)
         
         test_text = """
@@ -160,7 +105,10 @@ async def test_content_intelligence_with_llm():
         www.techsolutions.com
         """
         
-        result = await content_intelligence.analyze_content(test_text, "text")
+        # Results are reused for an hour; --no-cache forces a fresh LLM call
+        result = await cached_analyze(
+            test_text, "text", use_cache="--no-cache" not in sys.argv, max_age_seconds=3600
+        )
         
         print(f"✅ Analysis completed!")
         print(f"📊 Success: {result['success']}")
@@ -173,10 +121,8 @@ async def test_content_intelligence_with_llm():
         
         return True
         
-    except Exception as e:
-        print(f"❌ Content Intelligence test failed: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("❌ Content Intelligence test failed")
         return False
 
 async def main():
@@ -184,11 +130,14 @@ async def main():
     print("🔍 LLM Debugging Test Suite")
     print("=" * 50)
     
-    # Test 1: Direct LLM API calls
-    llm_result = await test_llm_directly()
-    
-    # Test 2: Content Intelligence with debugging
-    ci_result = await test_content_intelligence_with_llm()
+    try:
+        # Test 1: Direct LLM API calls
+        llm_result = await test_llm_directly()
+        
+        # Test 2: Content Intelligence with debugging
+        ci_result = await test_content_intelligence_with_llm()
+    finally:
+        await close_http_client()
     
     print("\n" + "=" * 50)
     print("📋 Debug Results:")
@@ -203,4 +152,9 @@ async def main():
         print("   4. Check for rate limiting or API restrictions")
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()  # libuv event loop for the concurrent provider calls
+    except ImportError:
+        pass
     asyncio.run(main())
@@ -3,20 +3,25 @@
 Test to reproduce the exact LLM response issue
 """
 import asyncio
-import os
+import logging
 import sys
 import json
+import time
+from typing import List, Optional
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
 
 # Add the backend directory to the path
-sys.path.append('/home/yuthar/contact-management-system/backend')
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-async def test_llm_with_exact_ocr_text():
-    """Test LLM with the exact text that's causing issues"""
-    try:
-        print("🔍 Testing LLM with exact OCR text that's failing...")
-        
-        # This is the exact text from your OCR (293 characters)
-        ocr_text = """John Doe
+from llm_test_client import PROVIDERS, available_providers, call_llm, close_http_client, configure_logging, stream_llm
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# This is the exact text from your OCR (293 characters)
+EXACT_OCR_TEXT = """John Doe
 Senior Software Engineer
 Tech Solutions Inc.
 john.doe@techsolutions.com
@@ -28,180 +33,236 @@ Additional contact information
 Business card details
 Professional services
 Contact for business inquiries"""
-        
-        print(f"📝 OCR text length: {len(ocr_text)} characters")
-        print(f"📝 OCR text preview: {repr(ocr_text[:100])}...")
-        
-        # Test with OpenAI if key is available
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if openai_key:
-            print(f"\n🤖 Testing OpenAI API...")
-            await test_openai_api(openai_key, ocr_text)
-        else:
-            print("❌ No OPENAI_API_KEY found")
-        
-        # Test with Groq if key is available
-        groq_key = os.getenv("GROQ_API_KEY")
-        if groq_key:
-            print(f"\n🤖 Testing Groq API...")
-            await test_groq_api(groq_key, ocr_text)
-        else:
-            print("❌ No GROQ_API_KEY found")
-        
-        if not openai_key and not groq_key:
-            print("\n💡 No API keys found. To test:")
-            print("   export OPENAI_API_KEY=sk-your-key")
-            print("   export GROQ_API_KEY=gsk-your-key")
-            print("   python test_llm_response.py")
-        
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
 
-async def test_openai_api(api_key, text):
-    """Test OpenAI API specifically"""
-    try:
-        import openai
-        
-        client = openai.OpenAI(api_key=api_key)
-        
-        # Use the exact same prompt as Content Intelligence
-        prompt = f"""You are a contact extraction expert. Extract contact information from the text and return a valid JSON array.
+# Cards per batched request, keeping the reply well inside max_tokens
+MAX_CARDS_PER_REQUEST = 20
+
+# JSON mode: the provider only returns syntactically valid JSON objects
+JSON_OBJECT = {"type": "json_object"}
+
+
+class ExtractedContact(BaseModel):
+    name: Optional[str] = ""
+    designation: Optional[str] = ""
+    company: Optional[str] = ""
+    email: Optional[str] = ""
+    phone: Optional[str] = ""
+    website: Optional[str] = ""
+    address: Optional[str] = ""
+    categories: List[str] = ["Others"]
+
+
+class ContactList(BaseModel):
+    contacts: List[ExtractedContact]
+
+
+CATEGORIES = '["Government", "Embassy", "Consulate", "High Commissioner", "Deputy High Commissioner", "Associations", "Exporter", "Importer", "Logistics", "Event management", "Consultancy", "Manufacturer", "Distributors", "Producers", "Others"]'
+
+# Instructions are sent as a fixed system message ahead of the OCR text,
+# so repeated requests share a prefix the provider can cache
+EXTRACTION_SYSTEM_PROMPT = f"""You are a contact extraction expert. Extract contact information from the text and return a valid JSON object.
 
 REQUIREMENTS:
-- Return ONLY a JSON array, nothing else
+- Return ONLY a JSON object of the form {{"contacts": [...]}}, nothing else
 - Each contact must have: name, designation, company, email, phone, website, address, categories
 - Use empty string "" for missing fields
-- Categories must be from: ["Government", "Embassy", "Consulate", "High Commissioner", "Deputy High Commissioner", "Associations", "Exporter", "Importer", "Logistics", "Event management", "Consultancy", "Manufacturer", "Distributors", "Producers", "Others"]
+- Categories must be from: {CATEGORIES}
 - Categories field must be an array like ["Others"]
 
 EXAMPLE:
-[{{"name":"John Doe","designation":"Manager","company":"ABC Corp","email":"john@abc.com","phone":"+1234567890","website":"","address":"123 Main St","categories":["Others"]}}]
+{{"contacts":[{{"name":"John Doe","designation":"Manager","company":"ABC Corp","email":"john@abc.com","phone":"+1234567890","website":"","address":"123 Main St","categories":["Others"]}}]}}
 
-If no contacts found, return: []
+If no contacts found, return: {{"contacts": []}}"""
 
-TEXT TO ANALYZE:
+EXTRACTION_USER_TEMPLATE = """TEXT TO ANALYZE:
 {text}
 
+RESPOND WITH JSON OBJECT:"""
+
+GROQ_SYSTEM_PROMPT = """Extract contact info from the user's text as a JSON object.
+
+Return: {"contacts":[{"name":"","email":"","phone":"","company":"","categories":["Others"]}]}"""
+
+BATCH_SYSTEM_PROMPT = f"""You are a contact extraction expert. Extract contact information from each numbered document and return a valid JSON array.
+
+REQUIREMENTS:
+- Return ONLY a JSON array with one entry per document, nothing else
+- Each entry must be {{"id": <document number>, "contacts": [...]}}
+- Each contact must have: name, designation, company, email, phone, website, address, categories
+- Use empty string "" for missing fields
+- Categories must be from: {CATEGORIES}
+- Categories field must be an array like ["Others"]
+
+EXAMPLE:
+[{{"id":1,"contacts":[{{"name":"John Doe","designation":"Manager","company":"ABC Corp","email":"john@abc.com","phone":"+1234567890","website":"","address":"123 Main St","categories":["Others"]}}]}},{{"id":2,"contacts":[]}}]"""
+
+BATCH_USER_TEMPLATE = """DOCUMENTS:
+{documents}
+
 RESPOND WITH JSON ARRAY:"""
+
+async def test_llm_with_exact_ocr_text(ocr_texts=None):
+    """Test LLM with the exact text that's causing issues, or with several OCR texts batched per request"""
+    try:
+        print("🔍 Testing LLM with exact OCR text that's failing...")
         
-        print(f"📤 Sending request to OpenAI...")
-        print(f"📝 Prompt length: {len(prompt)} characters")
+        if not ocr_texts:
+            ocr_texts = [EXACT_OCR_TEXT]
         
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=2000,
-            temperature=0.1
-        )
+        for ocr_text in ocr_texts:
+            print(f"📝 OCR text length: {len(ocr_text)} characters")
+            print(f"📝 OCR text preview: {repr(ocr_text[:100])}...")
         
-        print(f"✅ OpenAI API call successful")
-        print(f"🔍 Response object type: {type(response)}")
-        print(f"🔍 Response choices: {len(response.choices) if response.choices else 0}")
+        for cfg in PROVIDERS:
+            if not cfg["key"]:
+                print(f"❌ No {cfg['env']} found")
         
-        if response.choices:
-            choice = response.choices[0]
-            print(f"🔍 Choice finish_reason: {getattr(choice, 'finish_reason', 'unknown')}")
-            print(f"🔍 Message role: {getattr(choice.message, 'role', 'unknown')}")
-            
-            content = choice.message.content
-            print(f"🔍 Content type: {type(content)}")
-            print(f"🔍 Content length: {len(content) if content else 0}")
-            print(f"🔍 Content repr: {repr(content)}")
-            
-            if content:
-                print(f"📝 Content preview: {content[:200]}...")
-                
-                # Try to parse as JSON
-                try:
-                    parsed = json.loads(content.strip())
-                    print(f"✅ JSON parsing successful: {len(parsed)} contacts")
-                    if parsed:
-                        print(f"👤 First contact: {parsed[0]}")
-                except json.JSONDecodeError as e:
-                    print(f"❌ JSON parsing failed: {e}")
-                    print(f"🔍 Trying to find JSON in response...")
-                    
-                    # Try to extract JSON
-                    import re
-                    json_match = re.search(r'\[.*\]', content, re.DOTALL)
-                    if json_match:
-                        try:
-                            extracted = json.loads(json_match.group())
-                            print(f"✅ Extracted JSON successful: {len(extracted)} contacts")
-                        except:
-                            print(f"❌ Extracted JSON also failed")
-            else:
-                print(f"❌ OpenAI returned empty content")
+        # Query every configured provider at once
+        providers = available_providers()
+        if providers:
+            print(f"\n🤖 Testing {', '.join(cfg['label'] for cfg in providers)} API...")
+            await asyncio.gather(*(test_provider_batches(cfg, ocr_texts) for cfg in providers))
         else:
-            print(f"❌ OpenAI returned no choices")
-            
-    except Exception as e:
-        print(f"❌ OpenAI test failed: {e}")
-        import traceback
-        traceback.print_exc()
+            print("\n💡 No API keys found. To test:")
+            print("   export OPENAI_API_KEY=sk-your-key")
+            print("   export GROQ_API_KEY=gsk-your-key")
+            print("   python test_llm_response.py [ocr_text_file ...]")
+        
+    except Exception:
+        logger.exception("❌ Test failed")
+
+async def test_provider_batches(cfg, texts):
+    """Send texts to a provider in batches, falling back to one request per text when a batch fails"""
+    for start in range(0, len(texts), MAX_CARDS_PER_REQUEST):
+        batch = texts[start:start + MAX_CARDS_PER_REQUEST]
+        if len(batch) == 1 or not await test_provider_batch(cfg, batch, first_id=start + 1):
+            for text in batch:
+                await test_provider_api(cfg, text)
+
+def build_batch_prompt(texts, first_id=1):
+    """Return the system prompt and the numbered-documents message for a batch"""
+    documents = "\n---\n".join(f"{doc_id}. {text}" for doc_id, text in enumerate(texts, start=first_id))
+    return BATCH_SYSTEM_PROMPT, BATCH_USER_TEMPLATE.format(documents=documents)
 
-async def test_groq_api(api_key, text):
-    """Test Groq API specifically"""
+async def test_provider_batch(cfg, texts, first_id=1):
+    """Extract contacts for several texts in one request; returns False if the reply cannot be split per document"""
+    label = cfg["label"]
+    last_id = first_id + len(texts) - 1
     try:
-        import openai
+        system, prompt = build_batch_prompt(texts, first_id)
+        print(f"📤 Sending documents {first_id}-{last_id} to {label} in one request...")
+        print(f"📝 {label} batch prompt length: {len(system) + len(prompt)} characters")
         
-        client = openai.OpenAI(
-            api_key=api_key,
-            base_url="https://api.groq.com/openai/v1"
-        )
+        response = await call_llm(cfg, prompt, max_tokens=4000, temperature=0.1, system=system)
+        content = response.choices[0].message.content if response.choices else None
         
-        # Simple prompt for Groq
-        prompt = f"""Extract contact info as JSON array:
+        entries = json.loads(content.strip()) if content else None
+        results = {entry["id"]: entry.get("contacts", []) for entry in entries}
+    except Exception as e:
+        print(f"❌ {label} batch {first_id}-{last_id} failed ({e}), retrying one document per request")
+        return False
+    
+    print(f"\n✅ {label} batch {first_id}-{last_id} parsed")
+    for doc_id in range(first_id, last_id + 1):
+        contacts = results.get(doc_id)
+        if contacts is None:
+            print(f"❌ Document {doc_id}: missing from the {label} reply")
+        else:
+            print(f"✅ Document {doc_id}: {len(contacts)} contacts")
+            if contacts:
+                print(f"👤 First contact: {contacts[0]}")
+    return True
 
-{text}
+def build_prompt(provider, text):
+    """Return the system prompt, user message and request options used for a provider"""
+    if provider == "groq":
+        # Simple prompt for Groq
+        return GROQ_SYSTEM_PROMPT, text, {"max_tokens": 1000, "temperature": 0.0, "response_format": JSON_OBJECT}
+    
+    # Same requirements as Content Intelligence, as a JSON object
+    return EXTRACTION_SYSTEM_PROMPT, EXTRACTION_USER_TEMPLATE.format(text=text), {"max_tokens": 800, "temperature": 0.1, "response_format": JSON_OBJECT}
 
-Return: [{{"name":"","email":"","phone":"","company":"","categories":["Others"]}}]"""
+async def test_provider_api(cfg, text):
+    """Test one provider's API, streaming the reply, and report on what came back"""
+    label = cfg["label"]
+    try:
+        system, prompt, options = build_prompt(cfg["name"], text)
         
-        print(f"📤 Sending request to Groq...")
-        print(f"📝 Prompt length: {len(prompt)} characters")
+        print(f"📤 Sending request to {label}...")
+        print(f"📝 {label} prompt length: {len(system) + len(prompt)} characters")
         
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
-            model="mixtral-8x7b-32768",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=1000,
-            temperature=0.0
-        )
+        start_time = time.monotonic()
+        stream = await stream_llm(cfg, prompt, system=system, **options)
         
-        print(f"✅ Groq API call successful")
-        print(f"🔍 Response object type: {type(response)}")
-        print(f"🔍 Response choices: {len(response.choices) if response.choices else 0}")
+        chunks = []
+        first_token_time = None
+        finish_reason = None
+        parsed = None
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                delta = choice.delta.content
+                if not delta:
+                    continue
+                if first_token_time is None:
+                    first_token_time = time.monotonic() - start_time
+                chunks.append(delta)
+                
+                # Stop reading once a closing brace completes a valid contact list
+                if delta.rstrip().endswith(("}", "]")):
+                    try:
+                        parsed = ContactList.model_validate_json("".join(chunks))
+                        break
+                    except ValidationError:
+                        pass
+        finally:
+            await stream.response.aclose()
         
-        if response.choices:
-            choice = response.choices[0]
-            print(f"🔍 Choice finish_reason: {getattr(choice, 'finish_reason', 'unknown')}")
-            
-            content = choice.message.content
-            print(f"🔍 Content type: {type(content)}")
-            print(f"🔍 Content length: {len(content) if content else 0}")
-            print(f"🔍 Content repr: {repr(content)}")
+        content = "".join(chunks)
+        print(f"\n✅ {label} API call successful")
+        if first_token_time is not None:
+            print(f"🔍 First token after: {first_token_time:.2f}s, total: {time.monotonic() - start_time:.2f}s")
+        print(f"🔍 Choice finish_reason: {finish_reason or 'not reached'}")
+        print(f"🔍 Content length: {len(content)}")
+        print(f"🔍 Content repr: {repr(content)}")
+        
+        if content:
+            print(f"📝 Content preview: {content[:200]}...")
             
-            if content:
-                print(f"📝 Content preview: {content[:200]}...")
-                
-                # Try to parse as JSON
-                try:
-                    parsed = json.loads(content.strip())
-                    print(f"✅ JSON parsing successful: {len(parsed)} contacts")
-                except json.JSONDecodeError as e:
-                    print(f"❌ JSON parsing failed: {e}")
-            else:
-                print(f"❌ Groq returned empty content")
+            # JSON mode guarantees well-formed JSON; check it also has the contact shape
+            try:
+                if parsed is None:
+                    parsed = ContactList.model_validate_json(content)
+                print(f"✅ JSON parsing successful: {len(parsed.contacts)} contacts")
+                if parsed.contacts:
+                    print(f"👤 First contact: {parsed.contacts[0].model_dump()}")
+            except ValidationError as e:
+                print(f"❌ JSON parsing failed: {e}")
         else:
-            print(f"❌ Groq returned no choices")
+            print(f"❌ {label} returned empty content")
             
-    except Exception as e:
-        print(f"❌ Groq test failed: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("❌ %s test failed", label)
+
+async def main():
+    """Run the LLM response test and release the HTTP client"""
+    try:
+        # Extra OCR texts can be passed as files to test batched extraction
+        ocr_texts = []
+        for path in sys.argv[1:]:
+            with open(path) as f:
+                ocr_texts.append(f.read())
+        await test_llm_with_exact_ocr_text(ocr_texts)
+    finally:
+        await close_http_client()
 
 if __name__ == "__main__":
-    asyncio.run(test_llm_with_exact_ocr_text())
+    try:
+        import uvloop
+        uvloop.install()  # libuv event loop for the concurrent provider calls
+    except ImportError:
+        pass
+    asyncio.run(main())
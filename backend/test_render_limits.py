@@ -21,11 +21,8 @@ def test_file_size_limits():
     ]
     
     for case in test_cases:
-        # Set environment
-        os.environ["ENVIRONMENT"] = case["env"]
-        
-        # Test logic
-        is_render = os.getenv("ENVIRONMENT") == "production"
+        # Test logic, with the case's environment standing in for ENVIRONMENT
+        is_render = case["env"] == "production"
         max_size_mb = 1.5 if is_render else 2.0
         file_size_mb = case["file_size"]
         
@@ -47,9 +44,9 @@ def test_timeout_configuration():
         {"file_size": 1.2, "expected_ocr": 15, "expected_overall": 25},
     ]
     
+    is_render = os.getenv("ENVIRONMENT") == "production"
     for case in test_cases:
         file_size_mb = case["file_size"]
-        is_render = os.getenv("ENVIRONMENT") == "production"
         
         # OCR timeout logic (from api.py)
         if is_render:
@@ -82,10 +79,8 @@ def test_image_preprocessing_config():
     ]
     
     for case in test_cases:
-        os.environ["ENVIRONMENT"] = case["env"]
-        
-        # Logic from preprocess_business_card_image
-        is_render = os.getenv("ENVIRONMENT") == "production"
+        # Logic from preprocess_business_card_image, for the case's environment
+        is_render = case["env"] == "production"
         file_size_mb = case["file_size"]
         
         if is_render:
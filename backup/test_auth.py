@@ -4,20 +4,37 @@ Simple test API to verify authentication system works
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm, HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Enum
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import create_engine, select, bindparam, Column, Integer, String, Boolean, DateTime, Enum
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from passlib.context import CryptContext
+from passlib.hash import argon2
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
+from calendar import timegm
+from functools import lru_cache
+from typing import Optional, Tuple
+import base64
+import hashlib
+import hmac
+import json
 import os
+import time
 import enum
+from importlib.util import find_spec
+
+# ORJSONResponse imports orjson only when rendering, so just check it is installed
+ORJSON_AVAILABLE = find_spec("orjson") is not None
 
 # Database setup
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test_auth.sqlite")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+    query_cache_size=1200
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -46,6 +63,8 @@ class UserCreate(BaseModel):
     password: str
 
 class UserOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     username: str
     email: str
@@ -53,9 +72,6 @@ class UserOut(BaseModel):
     role: UserRole
     is_active: bool
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 class Token(BaseModel):
     access_token: str
@@ -70,7 +86,23 @@ SECRET_KEY = os.getenv("SECRET_KEY", "test-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2 when argon2-cffi is installed, with existing bcrypt hashes upgraded on login
+PASSWORD_SCHEMES = ["argon2", "bcrypt"] if argon2.has_backend() else ["bcrypt"]
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# Fixed parts of every HS256 token, computed once; the header matches jose's
+_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+_KEY_BYTES = SECRET_KEY.encode()
+
+pwd_context = CryptContext(
+    schemes=PASSWORD_SCHEMES,
+    deprecated="auto",
+    bcrypt__rounds=10,
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1
+)
 security = HTTPBearer()
 
 # Security functions
@@ -80,22 +112,35 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+def create_access_token(data: dict, expires_delta_s: Optional[int] = None):
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    
+    # exp as integer epoch seconds, which is what the token carries anyway
+    expire = int(time.time()) + (expires_delta_s or ACCESS_TOKEN_EXPIRE_MINUTES * 60)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _fast_hs256_encode(to_encode)
     return encoded_jwt
 
+def _fast_hs256_encode(payload: dict) -> str:
+    """Sign payload as an HS256 JWT, giving the same token jwt.encode would"""
+    claims = {
+        claim: timegm(value.utctimetuple()) if claim in ("exp", "iat", "nbf") and isinstance(value, datetime) else value
+        for claim, value in payload.items()
+    }
+    signing_input = _HEADER_B64 + b"." + _b64url(json.dumps(claims, separators=(",", ":")).encode())
+    signature = hmac.new(_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url(signature)).decode()
+
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str) -> Tuple[Optional[str], float]:
+    """Verify and decode a token once, returning its subject and expiry; raises JWTError"""
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return payload.get("sub"), payload.get("exp", float("inf"))
+
 def verify_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+        username, expires_at = _decode_cached(token)
+        # A cached token can outlive its exp, so check it on every hit
+        if username is None or expires_at <= time.time():
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
@@ -109,15 +154,22 @@ def verify_token(token: str):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+# Built once so every auth lookup hits the same compiled-statement cache entry
+_USER_BY_NAME = select(User).where(User.username == bindparam("username"))
+
 def get_user_by_username(db: Session, username: str):
-    return db.query(User).filter(User.username == username).first()
+    return db.execute(_USER_BY_NAME, {"username": username}).scalar_one_or_none()
 
 def authenticate_user(db: Session, username: str, password: str):
     user = get_user_by_username(db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = pwd_context.verify_and_update(password, user.hashed_password)
+    if not verified:
         return False
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
 # Database dependency
@@ -149,7 +201,11 @@ async def get_current_user(
     return user
 
 # Create FastAPI app
-app = FastAPI(title="Authentication Test API", version="1.0.0")
+app = FastAPI(
+    title="Authentication Test API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+)
 
 # CORS Configuration
 app.add_middleware(
@@ -160,8 +216,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create tables; SQLite records the schema version it was created at, so
+# later starts skip the per-table existence checks. Bump after model changes.
+SCHEMA_VERSION = 1
+
+def create_tables():
+    if engine.dialect.name != "sqlite":
+        Base.metadata.create_all(bind=engine)
+        return
+    with engine.begin() as conn:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() != SCHEMA_VERSION:
+            Base.metadata.create_all(bind=conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+create_tables()
 
 # Routes
 @app.get("/")
@@ -171,6 +239,10 @@ def read_root():
 @app.post("/auth/register", response_model=UserOut)
 def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
+    # Hash before the first query so the session's connection is not held
+    # through the slow hash
+    hashed_password = get_password_hash(user_data.password)
+    
     # Check if user already exists
     if get_user_by_username(db, user_data.username):
         raise HTTPException(
@@ -179,7 +251,6 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
     db_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -206,9 +277,8 @@ def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username}, expires_delta_s=ACCESS_TOKEN_EXPIRE_MINUTES * 60
     )
     
     return {
@@ -227,9 +297,8 @@ def login_simple(user_data: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username}, expires_delta_s=ACCESS_TOKEN_EXPIRE_MINUTES * 60
     )
     
     return {
@@ -5,25 +5,54 @@ Handles image processing, OCR, and intelligent contact extraction
 """
 from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import asyncio
+import base64
+import concurrent.futures
+import hashlib
 import io
 import os
 import logging
+import re
 import uuid
+import warnings
 import json
+import tempfile
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+# Contact patterns for the rule-based extraction paths
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b', re.IGNORECASE)
+PHONE_RE = re.compile(r'[+]?[1-9]?[\d\s\-()]{8,15}')
+YEARS_RE = re.compile(r'(\d+)\+?\s*years?')
+JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+# Stand-in answer when an LLM call fails or comes back empty
+EMPTY_CONTACT_JSON = '[{"name":"","designation":"","company":"","email":"","phone":"","website":"","address":"","categories":["Others"]}]'
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson parses LLM answers and job records and serializes responses when installed;
+# its JSONDecodeError subclasses json's, so either parser's errors are caught alike
+json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+ResponseClass = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
 # Initialize FastAPI app
 app = FastAPI(
     title="OCR Microservice",
     description="Intelligent OCR processing for contact management",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ResponseClass
 )
 
 # CORS configuration
@@ -36,16 +65,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Largest image OCR accepts; bigger JPEGs are decoded at reduced scale, anything else is refused
+OCR_MAX_IMAGE_PIXELS = int(os.getenv("OCR_MAX_IMAGE_PIXELS", "40000000"))
+OCR_DRAFT_SIZE = (2000, 2000)
+
+# Longest side each strategy scales images down to before OCR
+PREPROCESS_MAX_DIM = {"fast": 800, "enhanced": 1200}
+
+# A fast-strategy result with at least this mean word confidence (0-100) and text length is
+# taken as final, and the slower strategies are not run
+OCR_CONFIDENT_MEAN_CONF = float(os.getenv("OCR_CONFIDENT_MEAN_CONF", "75"))
+OCR_CONFIDENT_MIN_CHARS = 40
+
 # Optional imports with graceful fallback
 try:
     import pytesseract
     from PIL import Image, ImageEnhance
+    # Pillow refuses to open images over twice this size before reading any pixel data
+    Image.MAX_IMAGE_PIXELS = OCR_MAX_IMAGE_PIXELS
     OCR_AVAILABLE = True
     logger.info("✅ OCR dependencies loaded successfully")
 except ImportError as e:
     OCR_AVAILABLE = False
     logger.warning(f"⚠️ OCR dependencies not available: {e}")
 
+try:
+    import cv2
+    import numpy as np
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 try:
     import openai
     LLM_AVAILABLE = True
@@ -71,8 +127,215 @@ except ImportError:
     GEMINI_AVAILABLE = False
     logger.warning("⚠️ Gemini client not available")
 
-# In-memory job storage (use Redis in production)
-job_storage = {}
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Jobs live in Redis when REDIS_URL is set, so every worker and restart sees them;
+# otherwise they fall back to this process's memory, with the same expiry and a size cap
+REDIS_URL = os.getenv("REDIS_URL")
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+JOB_STORAGE_SIZE = int(os.getenv("JOB_STORAGE_SIZE", "10000"))
+redis_client = aioredis.from_url(REDIS_URL) if REDIS_AVAILABLE and REDIS_URL else None
+if REDIS_URL and not REDIS_AVAILABLE:
+    logger.warning("⚠️ REDIS_URL is set but redis is not installed, keeping jobs in memory")
+# job_id -> (expires_at, record), oldest write first
+job_storage = OrderedDict()
+
+try:
+    import dramatiq
+    from dramatiq.brokers.redis import RedisBroker
+    from dramatiq.middleware.asyncio import AsyncIO
+    DRAMATIQ_AVAILABLE = True
+except ImportError:
+    DRAMATIQ_AVAILABLE = False
+
+# OCR_JOB_QUEUE=dramatiq hands /process-async jobs to a separate `dramatiq app`
+# worker process; it needs Redis for both the broker and the job records
+USE_JOB_QUEUE = os.getenv("OCR_JOB_QUEUE") == "dramatiq"
+if USE_JOB_QUEUE and not (DRAMATIQ_AVAILABLE and redis_client is not None):
+    logger.warning("⚠️ OCR_JOB_QUEUE=dramatiq needs dramatiq and REDIS_URL, running jobs in-process")
+    USE_JOB_QUEUE = False
+if USE_JOB_QUEUE:
+    broker = RedisBroker(url=REDIS_URL)
+    broker.add_middleware(AsyncIO())
+    dramatiq.set_broker(broker)
+
+async def set_job(job_id: str, data: Dict[str, Any]):
+    """Store a job record, expiring it after JOB_TTL_SECONDS in Redis"""
+    if redis_client is None:
+        now = time.monotonic()
+        job_storage[job_id] = (now + JOB_TTL_SECONDS, data)
+        job_storage.move_to_end(job_id)
+        # Every write gets the same TTL, so expired records are always at the front
+        while job_storage and (len(job_storage) > JOB_STORAGE_SIZE or next(iter(job_storage.values()))[0] <= now):
+            job_storage.popitem(last=False)
+        return
+    await redis_client.set(f"job:{job_id}", json.dumps(data), ex=JOB_TTL_SECONDS)
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return a job record, or None if it does not exist or has expired"""
+    if redis_client is None:
+        expires_at, data = job_storage.get(job_id, (0, None))
+        return data if expires_at > time.monotonic() else None
+    data = await redis_client.get(f"job:{job_id}")
+    return json_loads(data) if data is not None else None
+
+async def update_job(job_id: str, **fields):
+    """Merge fields into a job record"""
+    job = await get_job(job_id) or {}
+    job.update(fields)
+    await set_job(job_id, job)
+
+# LLM extractions are cached by OCR text, so re-uploads of the same card skip the API call;
+# in Redis when it is configured, otherwise in a bounded in-process LRU
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+llm_cache = OrderedDict()
+
+def llm_cache_key(text: str, provider_name: str, model: str) -> str:
+    return f"llm:{hashlib.sha256(text.encode()).hexdigest()}:{provider_name}:{model}"
+
+# /process-sync OCR results can be cached by image digest the same way (off by default;
+# useful where the same cards are re-sent, e.g. a test deployment)
+OCR_RESULT_CACHE = os.getenv("OCR_RESULT_CACHE", "false").lower() in ("1", "true", "yes")
+OCR_CACHE_SIZE = int(os.getenv("OCR_CACHE_SIZE", "256"))
+ocr_cache = OrderedDict()
+
+def ocr_cache_key(image_data: bytes, strategies: List[Any], timeout: int) -> str:
+    """Key an OCR result by image digest and everything that decides which text is returned"""
+    strategy_names = ",".join(strategy.__name__ for strategy in strategies)
+    digest = hashlib.sha256(image_data).hexdigest()
+    return f"ocr:{digest}:{strategy_names}:{OCR_CONFIDENT_MEAN_CONF:g}:{timeout}"
+
+async def get_cached(lru: OrderedDict, key: str) -> Optional[Any]:
+    """Return the value cached under key, or None on a miss; lru is used when Redis is not configured"""
+    if redis_client is None:
+        value = lru.get(key)
+        if value is not None:
+            lru.move_to_end(key)
+        return value
+    try:
+        data = await redis_client.get(key)
+    except Exception as e:
+        logger.warning(f"Cache lookup failed for {key}: {e}")
+        return None
+    return json_loads(data) if data is not None else None
+
+async def set_cached(lru: OrderedDict, max_size: int, key: str, value: Any):
+    """Cache value under key for LLM_CACHE_TTL_SECONDS; lru is used when Redis is not configured"""
+    if redis_client is None:
+        lru[key] = value
+        lru.move_to_end(key)
+        while len(lru) > max_size:
+            lru.popitem(last=False)
+        return
+    try:
+        await redis_client.set(key, json.dumps(value), ex=LLM_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Cache store failed for {key}: {e}")
+
+async def get_cached_contacts(key: str) -> Optional[List[Dict[str, Any]]]:
+    """Return the contacts cached under key, or None on a miss"""
+    return await get_cached(llm_cache, key)
+
+async def set_cached_contacts(key: str, contacts: List[Dict[str, Any]]):
+    """Cache contacts under key for LLM_CACHE_TTL_SECONDS"""
+    await set_cached(llm_cache, LLM_CACHE_SIZE, key, contacts)
+
+# /process-async copies uploads to disk this many bytes at a time
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+# Background jobs queued together share one tesseract process for their fast pass
+OCR_BATCH_SIZE = int(os.getenv("OCR_BATCH_SIZE", "16"))
+OCR_BATCH_WAIT_SECONDS = float(os.getenv("OCR_BATCH_WAIT_MS", "50")) / 1000
+
+# Decoding, preprocessing and tesseract run in worker processes, outside this process's GIL;
+# at least one per strategy, since a worker mostly waits on its tesseract subprocess
+OCR_PROCESSES = int(os.getenv("OCR_PROCESSES", str(max(os.cpu_count() or 1, 3))))
+_ocr_executor = None
+
+def get_ocr_executor() -> concurrent.futures.ProcessPoolExecutor:
+    """Return the OCR process pool, starting it on first use"""
+    global _ocr_executor
+    if _ocr_executor is None:
+        _ocr_executor = concurrent.futures.ProcessPoolExecutor(max_workers=OCR_PROCESSES)
+    return _ocr_executor
+
+def open_image(image_data: bytes) -> Image.Image:
+    """Open uploaded image data, shrinking or refusing images over OCR_MAX_IMAGE_PIXELS before decoding"""
+    with warnings.catch_warnings():
+        # Oversized images are handled below
+        warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+        image = Image.open(io.BytesIO(image_data))
+    if image.width * image.height > OCR_MAX_IMAGE_PIXELS:
+        # Only JPEG can decode straight to a fraction of its size; draft is a no-op elsewhere
+        image.draft("L", OCR_DRAFT_SIZE)
+        if image.width * image.height > OCR_MAX_IMAGE_PIXELS:
+            raise Image.DecompressionBombError(
+                f"Image size ({image.width}x{image.height} pixels) exceeds the limit of {OCR_MAX_IMAGE_PIXELS} pixels"
+            )
+    return image
+
+def _preprocess_image_data(image_data: bytes, strategy: str) -> Image.Image:
+    """Decode and preprocess an uploaded image; top-level so the process pool can run it"""
+    image = open_image(image_data)
+    max_dim = PREPROCESS_MAX_DIM.get(strategy)
+    if max_dim:
+        # JPEGs decode in grayscale at the smallest 1/2-1/8 scale still covering the strategy's resize
+        image.draft("L", (max_dim, max_dim))
+    return ocr_processor.preprocess_image(image, strategy)
+
+# tesserocr engines of this worker process by OCR engine mode, loaded once and kept for every later image
+_tesserocr_apis = {}
+
+def _tesserocr_api(image: Image.Image, config: str):
+    """Return this process's engine for the --oem in a tesseract config string, set to read image with its --psm"""
+    options = dict(re.findall(r'--(psm|oem) (\d+)', config))
+    oem = int(options.get("oem", tesserocr.OEM.DEFAULT))
+    api = _tesserocr_apis.get(oem)
+    if api is None:
+        api = _tesserocr_apis[oem] = tesserocr.PyTessBaseAPI(oem=oem)
+    api.SetPageSegMode(int(options.get("psm", tesserocr.PSM.AUTO)))
+    api.SetImage(image)
+    return api
+
+def _tesserocr_to_string(image: Image.Image, config: str) -> str:
+    """OCR an image in-process with the --psm and --oem given in a tesseract config string"""
+    return _tesserocr_api(image, config).GetUTF8Text()
+
+def _run_strategy(image_data: bytes, strategy: str, config: str, timeout: int) -> str:
+    """Decode, preprocess and OCR an image; a tesseract subprocess is killed after timeout seconds (0 = none)"""
+    image = _preprocess_image_data(image_data, strategy)
+    if TESSEROCR_AVAILABLE:
+        # Pool workers run one task at a time, so their engines need no locking
+        return _tesserocr_to_string(image, config)
+    return pytesseract.image_to_string(image, config=config, timeout=timeout)
+
+def _run_strategy_scored(image_data: bytes, strategy: str, config: str, timeout: int) -> Tuple[str, float]:
+    """_run_strategy, also returning tesseract's mean word confidence (0-100)"""
+    image = _preprocess_image_data(image_data, strategy)
+    if TESSEROCR_AVAILABLE:
+        api = _tesserocr_api(image, config)
+        return api.GetUTF8Text(), float(api.MeanTextConf())
+    
+    data = pytesseract.image_to_data(image, config=config, timeout=timeout, output_type=pytesseract.Output.DICT)
+    # Rebuild the text line by line from the recognized words; layout rows have a confidence of -1
+    lines = {}
+    confidences = []
+    for word, conf, block, par, line in zip(data["text"], data["conf"], data["block_num"], data["par_num"], data["line_num"]):
+        if float(conf) < 0 or not word.strip():
+            continue
+        confidences.append(float(conf))
+        lines.setdefault((block, par, line), []).append(word)
+    text = "\n".join(" ".join(words) for words in lines.values())
+    return text, sum(confidences) / len(confidences) if confidences else 0.0
 
 class OCRProcessor:
     """Handles OCR processing with multiple strategies"""
@@ -83,6 +346,8 @@ class OCRProcessor:
             self.enhanced_ocr,
             self.fallback_ocr
         ]
+        self._batch_queue = None
+        self._batch_worker = None
     
     def preprocess_image(self, image: Image.Image, strategy: str = "fast") -> Image.Image:
         """Preprocess image for OCR with different strategies"""
@@ -93,10 +358,13 @@ class OCRProcessor:
             
             width, height = image.size
             
+            if CV2_AVAILABLE and strategy in ("fast", "enhanced"):
+                return self._preprocess_with_cv2(image, strategy)
+            
             # Strategy-based preprocessing
             if strategy == "fast":
                 # Ultra-fast preprocessing
-                max_dim = 800
+                max_dim = PREPROCESS_MAX_DIM["fast"]
                 if width > max_dim or height > max_dim:
                     scale = min(max_dim/width, max_dim/height)
                     new_size = (int(width * scale), int(height * scale))
@@ -107,11 +375,13 @@ class OCRProcessor:
             
             elif strategy == "enhanced":
                 # Better quality preprocessing
-                max_dim = 1200
+                max_dim = PREPROCESS_MAX_DIM["enhanced"]
                 if width > max_dim or height > max_dim:
                     scale = min(max_dim/width, max_dim/height)
                     new_size = (int(width * scale), int(height * scale))
-                    image = image.resize(new_size, Image.Resampling.LANCZOS)
+                    # Lanczos only pays for itself on heavy downscales, where aliasing would blur text
+                    resample = Image.Resampling.LANCZOS if scale < 0.5 else Image.Resampling.BILINEAR
+                    image = image.resize(new_size, resample)
                 
                 # Convert to grayscale and enhance
                 gray = image.convert('L')
@@ -126,70 +396,215 @@ class OCRProcessor:
             logger.warning(f"Image preprocessing failed: {e}")
             return image.convert('L') if image.mode != 'L' else image
     
-    async def fast_ocr(self, image: Image.Image) -> str:
+    def _preprocess_with_cv2(self, image: Image.Image, strategy: str) -> Image.Image:
+        """OpenCV version of the fast and enhanced preprocessing: grayscale first, then one area resize"""
+        arr = np.asarray(image)
+        gray = cv2.cvtColor(arr, cv2.COLOR_RGB2GRAY) if arr.ndim == 3 else arr
+        
+        max_dim = PREPROCESS_MAX_DIM[strategy]
+        height, width = gray.shape
+        if width > max_dim or height > max_dim:
+            scale = min(max_dim/width, max_dim/height)
+            gray = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        
+        if strategy == "enhanced":
+            # Local contrast equalization, then an Otsu-chosen black/white threshold
+            gray = cv2.createCLAHE(clipLimit=2.0).apply(gray)
+            _, gray = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        
+        return Image.fromarray(gray)
+    
+    async def _run_in_pool(self, image_data: bytes, strategy: str, config: str, timeout: int, scored: bool = False):
+        loop = asyncio.get_running_loop()
+        run = _run_strategy_scored if scored else _run_strategy
+        return await loop.run_in_executor(get_ocr_executor(), run, image_data, strategy, config, timeout)
+    
+    async def fast_ocr(self, image_data: bytes, timeout: int = 0) -> str:
         """Fast OCR with minimal preprocessing"""
-        processed = self.preprocess_image(image, "fast")
-        return pytesseract.image_to_string(processed, config='--psm 6 --oem 1')
+        return await self._run_in_pool(image_data, "fast", '--psm 6 --oem 1', timeout)
     
-    async def enhanced_ocr(self, image: Image.Image) -> str:
+    async def fast_ocr_scored(self, image_data: bytes, timeout: int = 0) -> Tuple[str, float]:
+        """fast_ocr, also returning the mean word confidence"""
+        return await self._run_in_pool(image_data, "fast", '--psm 6 --oem 1', timeout, scored=True)
+    
+    async def enhanced_ocr(self, image_data: bytes, timeout: int = 0) -> str:
         """Enhanced OCR with better preprocessing"""
-        processed = self.preprocess_image(image, "enhanced")
-        return pytesseract.image_to_string(processed, config='--psm 6 --oem 3')
+        return await self._run_in_pool(image_data, "enhanced", '--psm 6 --oem 3', timeout)
     
-    async def fallback_ocr(self, image: Image.Image) -> str:
+    async def fallback_ocr(self, image_data: bytes, timeout: int = 0) -> str:
         """Fallback OCR with different settings"""
-        processed = self.preprocess_image(image, "fallback")
-        return pytesseract.image_to_string(processed, config='--psm 4 --oem 1')
+        return await self._run_in_pool(image_data, "fallback", '--psm 4 --oem 1', timeout)
     
-    async def process_image(self, image_data: bytes, timeout: int = 30) -> Dict[str, Any]:
-        """Process image with multiple OCR strategies"""
+    def _ocr_batch(self, images: List[Image.Image]) -> List[str]:
+        """Run the fast OCR pass over several images with a single tesseract process"""
+        with tempfile.TemporaryDirectory(prefix="ocr-batch-") as tmp_dir:
+            paths = []
+            for n, image in enumerate(images):
+                path = os.path.join(tmp_dir, f"{n}.png")
+                image.save(path)
+                paths.append(path)
+            list_path = os.path.join(tmp_dir, "images.txt")
+            with open(list_path, "w") as f:
+                f.write("\n".join(paths) + "\n")
+            # Tesseract reads a .txt argument as a list of images and ends each page with a form feed
+            text = pytesseract.image_to_string(list_path, config='--psm 6 --oem 1')
+        
+        pages = text.split("\x0c")
+        if len(pages) < len(images):
+            raise RuntimeError(f"Tesseract returned {len(pages)} pages for {len(images)} images")
+        return pages[:len(images)]
+    
+    async def _run_batches(self):
+        """Collect queued images for up to OCR_BATCH_WAIT_SECONDS and OCR each batch at once"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._batch_queue.get()]
+            deadline = loop.time() + OCR_BATCH_WAIT_SECONDS
+            while len(batch) < OCR_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._batch_queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            images = [image for image, _ in batch]
+            try:
+                texts = await asyncio.to_thread(self._ocr_batch, images)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            logger.info(f"Batched OCR processed {len(batch)} images in one tesseract run")
+            for (_, future), text in zip(batch, texts):
+                if not future.done():
+                    future.set_result(text)
+    
+    async def process_image_batched(self, image_data: bytes, timeout: int = 60) -> Dict[str, Any]:
+        """
+        Process image with the fast strategy batched alongside other queued images,
+        falling back to the remaining strategies one by one
+        """
         if not OCR_AVAILABLE:
             raise HTTPException(status_code=503, detail="OCR service not available")
         
+        if self._batch_worker is None or self._batch_worker.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker = asyncio.create_task(self._run_batches())
+        
         try:
-            image = Image.open(io.BytesIO(image_data))
+            image = open_image(image_data)
             width, height = image.size
             file_size_mb = len(image_data) / (1024 * 1024)
             
+            future = asyncio.get_running_loop().create_future()
+            processed = await asyncio.get_running_loop().run_in_executor(
+                get_ocr_executor(), _preprocess_image_data, image_data, "fast"
+            )
+            await self._batch_queue.put((processed, future))
+            text = await asyncio.wait_for(future, timeout=max(5, timeout // 2))
+            
+            if text.strip():
+                logger.info(f"Batched strategy 1 succeeded, extracted {len(text)} characters")
+                return {
+                    "success": True,
+                    "text": text.strip(),
+                    "strategy_used": 1,
+                    "image_info": {
+                        "width": width,
+                        "height": height,
+                        "size_mb": file_size_mb
+                    }
+                }
+        except asyncio.TimeoutError:
+            logger.warning("Batched strategy 1 timed out")
+        except Exception as e:
+            logger.warning(f"Batched strategy 1 failed: {e}")
+        
+        return await self.process_image(image_data, timeout=timeout, skip_strategies=1)
+    
+    async def process_image(self, image_data: bytes, timeout: int = 30, skip_strategies: int = 0) -> Dict[str, Any]:
+        """Process image with multiple OCR strategies, optionally skipping the first ones"""
+        if not OCR_AVAILABLE:
+            raise HTTPException(status_code=503, detail="OCR service not available")
+        
+        try:
+            image = open_image(image_data)
+            width, height = image.size
+            file_size_mb = len(image_data) / (1024 * 1024)
+            
+            image_info = {
+                "width": width,
+                "height": height,
+                "size_mb": file_size_mb
+            }
+            
             logger.info(f"Processing image: {width}x{height}, {file_size_mb:.1f}MB")
             
-            # Try strategies in order with timeout
-            for i, strategy in enumerate(self.strategies):
+            timeout = max(5, timeout)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            
+            # Run the fast strategy alone first; the others are only worth their CPU when it is unsure
+            low_confidence_text = ""
+            if skip_strategies == 0:
                 try:
-                    strategy_timeout = max(5, timeout // len(self.strategies))
-                    text = await asyncio.wait_for(
-                        strategy(image), 
-                        timeout=strategy_timeout
-                    )
-                    
-                    if text.strip():
-                        logger.info(f"Strategy {i+1} succeeded, extracted {len(text)} characters")
-                        return {
-                            "success": True,
-                            "text": text.strip(),
-                            "strategy_used": i + 1,
-                            "image_info": {
-                                "width": width,
-                                "height": height,
-                                "size_mb": file_size_mb
-                            }
-                        }
+                    text, confidence = await asyncio.wait_for(self.fast_ocr_scored(image_data, timeout), timeout)
+                    text = text.strip()
+                    if confidence >= OCR_CONFIDENT_MEAN_CONF and len(text) >= OCR_CONFIDENT_MIN_CHARS:
+                        logger.info(f"Strategy 1 succeeded with confidence {confidence:.0f}, extracted {len(text)} characters")
+                        return {"success": True, "text": text, "strategy_used": 1, "image_info": image_info}
+                    logger.info(f"Strategy 1 confidence {confidence:.0f} on {len(text)} characters, trying the other strategies")
+                    low_confidence_text = text
                 except asyncio.TimeoutError:
-                    logger.warning(f"Strategy {i+1} timed out after {strategy_timeout}s")
-                    continue
+                    logger.warning(f"Strategy 1 timed out after {timeout}s")
                 except Exception as e:
-                    logger.warning(f"Strategy {i+1} failed: {e}")
-                    continue
+                    logger.warning(f"Strategy 1 failed: {e}")
+                skip_strategies = 1
+            
+            # Run the remaining strategies concurrently and take the first non-empty text
+            remaining = max(1, int(deadline - loop.time()))
+            tasks = {
+                asyncio.create_task(strategy(image_data, remaining)): number
+                for number, strategy in enumerate(self.strategies[skip_strategies:], start=skip_strategies + 1)
+            }
+            pending = set(tasks)
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=max(0, deadline - loop.time()),
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        logger.warning(f"Strategies {sorted(tasks[task] for task in pending)} timed out after {timeout}s")
+                        break
+                    
+                    # Prefer the earlier strategy when several finish together
+                    for task in sorted(done, key=tasks.get):
+                        number = tasks[task]
+                        if task.exception() is not None:
+                            logger.warning(f"Strategy {number} failed: {task.exception()}")
+                            continue
+                        text = task.result()
+                        if text.strip():
+                            logger.info(f"Strategy {number} succeeded, extracted {len(text)} characters")
+                            return {"success": True, "text": text.strip(), "strategy_used": number, "image_info": image_info}
+            finally:
+                for task in pending:
+                    task.cancel()
+            
+            # Nothing better came back, so settle for the unsure fast result
+            if low_confidence_text:
+                return {"success": True, "text": low_confidence_text, "strategy_used": 1, "image_info": image_info}
             
             # All strategies failed
             return {
                 "success": False,
                 "error": "All OCR strategies failed or timed out",
-                "image_info": {
-                    "width": width,
-                    "height": height,
-                    "size_mb": file_size_mb
-                }
+                "image_info": image_info
             }
             
         except Exception as e:
@@ -199,12 +614,77 @@ class OCRProcessor:
                 "error": f"Image processing failed: {str(e)}"
             }
 
+# Background jobs whose OCR finishes together share one LLM request for their extraction.
+# A batch answer has to fit in LLM_BATCH_MAX_TOKENS, so a batch holds at most as many
+# documents as that budget allows at LLM_BATCH_TOKENS_PER_DOCUMENT each
+LLM_BATCH_MAX_TOKENS = 4096
+LLM_BATCH_TOKENS_PER_DOCUMENT = 400
+LLM_BATCH_SIZE = min(
+    int(os.getenv("LLM_BATCH_SIZE", "8")),
+    LLM_BATCH_MAX_TOKENS // LLM_BATCH_TOKENS_PER_DOCUMENT
+)
+LLM_BATCH_WAIT_SECONDS = float(os.getenv("LLM_BATCH_WAIT_MS", "50")) / 1000
+
+# Contact fields and rules shared by the single-text and batch system prompts
+CONTACT_SCHEMA = """Each contact should have these fields: name, designation, company, email, phone, website, address, categories, notes.
+
+Categories should be one or more of: Government, Embassy, Consulate, High Commissioner, Deputy High Commissioner,
+Associations, Exporter, Importer, Logistics, Event management, Consultancy, Manufacturer, Distributors, Producers, Others."""
+
+CONTACT_FIELD_RULES = """3. Ensure all fields are strings (use empty string "" if not found)
+4. Categories should be array of strings
+5. Clean and format phone numbers consistently
+6. Validate email addresses
+7. Notes should be SHORT (max 80 chars) with only key info: qualifications, years experience, or main specialization"""
+
+EXAMPLE_CONTACT = '{"name":"John Doe","designation":"Manager","company":"ABC Corp","email":"john@abc.com","phone":"+1234567890","website":"","address":"123 Main St","categories":["Others"],"notes":"MBA, 10+ years exp, speaks Spanish"}'
+
+# Fixed extraction rules, sent ahead of the OCR text as the system prompt so
+# providers can reuse the cached prefix across requests
+EXTRACTION_SYSTEM_PROMPT = f"""Extract contact information from the following text and return as JSON array.
+{CONTACT_SCHEMA}
+
+Rules:
+1. Return only valid JSON array, no other text
+2. If no clear contacts found, return empty array []
+{CONTACT_FIELD_RULES}
+
+Example with concise notes:
+[{EXAMPLE_CONTACT}]"""
+
+# Batched requests answer for several documents at once, so their output format differs
+BATCH_EXTRACTION_SYSTEM_PROMPT = f"""Extract contact information from each numbered document that follows, separately,
+and return one JSON object whose keys are the document numbers and whose values are the JSON array of contacts for that document.
+{CONTACT_SCHEMA}
+
+Rules:
+1. Return only valid JSON object, no other text
+2. If a document has no clear contacts, its value is an empty array []
+{CONTACT_FIELD_RULES}
+
+Example for two documents, the second without contacts:
+{{"1":[{EXAMPLE_CONTACT}],"2":[]}}"""
+
+# The per-request user prompts; only the OCR text varies, so they are filled in with str.format
+EXTRACTION_PROMPT_TEMPLATE = """Text to process:
+{text}
+
+JSON Response:"""
+
+BATCH_EXTRACTION_PROMPT_TEMPLATE = """Documents to process ("1" to "{count}"):
+
+{documents}
+
+JSON Response:"""
+
 class LLMProcessor:
     """Handles LLM-powered contact extraction and categorization with multiple providers"""
 
     def __init__(self):
         self.providers = {}
         self.default_provider = None
+        self._batch_queue = None
+        self._batch_worker = None
 
         # Initialize OpenAI
         if LLM_AVAILABLE:
@@ -212,7 +692,7 @@ class LLMProcessor:
             base_url = os.getenv("OPENAI_BASE_URL")  # For OpenAI-compatible APIs
             if api_key:
                 self.providers["openai"] = {
-                    "client": openai.OpenAI(api_key=api_key, base_url=base_url),
+                    "client": openai.AsyncOpenAI(api_key=api_key, base_url=base_url),
                     "model": os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
                     "type": "openai"
                 }
@@ -225,7 +705,7 @@ class LLMProcessor:
             api_key = os.getenv("ANTHROPIC_API_KEY")
             if api_key:
                 self.providers["anthropic"] = {
-                    "client": anthropic.Anthropic(api_key=api_key),
+                    "client": anthropic.AsyncAnthropic(api_key=api_key),
                     "model": os.getenv("ANTHROPIC_MODEL", "claude-3-haiku-20240307"),
                     "type": "anthropic"
                 }
@@ -260,7 +740,7 @@ class LLMProcessor:
             if api_key:
                 model_key = f"{provider_name.upper()}_MODEL"
                 self.providers[provider_name] = {
-                    "client": openai.OpenAI(api_key=api_key, base_url=base_url),
+                    "client": openai.AsyncOpenAI(api_key=api_key, base_url=base_url),
                     "model": os.getenv(model_key, default_model),
                     "type": "openai_compatible"
                 }
@@ -286,34 +766,34 @@ class LLMProcessor:
 
         provider_config = self.providers[provider_name]
 
+        cache_key = llm_cache_key(text, provider_name, provider_config["model"])
+        cached = await get_cached_contacts(cache_key)
+        if cached is not None:
+            logger.info(f"LLM ({provider_name}) cache hit: {len(cached)} contacts")
+            return cached
+
         try:
             prompt = self._create_extraction_prompt(text)
-
-            if provider_config["type"] == "openai" or provider_config["type"] == "openai_compatible":
-                result = await self._extract_with_openai_api(provider_config, prompt)
-            elif provider_config["type"] == "anthropic":
-                result = await self._extract_with_anthropic(provider_config, prompt)
-            elif provider_config["type"] == "gemini":
-                result = await self._extract_with_gemini(provider_config, prompt)
-            else:
-                raise ValueError(f"Unknown provider type: {provider_config['type']}")
+            result = await self._call_provider(provider_config, prompt)
 
             # Enhanced JSON parsing with error handling
             try:
-                contacts = json.loads(result)
+                contacts = json_loads(result)
                 logger.info(f"LLM ({provider_name}) extracted {len(contacts)} contacts")
+                if result != EMPTY_CONTACT_JSON:
+                    await set_cached_contacts(cache_key, contacts)
                 return contacts
             except json.JSONDecodeError as json_error:
                 logger.warning(f"JSON parsing failed for LLM response: {json_error}")
                 logger.warning(f"Raw LLM response: {repr(result)}")
 
                 # Try to extract JSON from response
-                import re
-                json_match = re.search(r'\[.*\]', result, re.DOTALL)
+                json_match = JSON_ARRAY_RE.search(result)
                 if json_match:
                     try:
-                        contacts = json.loads(json_match.group())
+                        contacts = json_loads(json_match.group())
                         logger.info(f"Extracted JSON successfully: {len(contacts)} contacts")
+                        await set_cached_contacts(cache_key, contacts)
                         return contacts
                     except json.JSONDecodeError:
                         logger.warning("Extracted JSON also failed to parse")
@@ -326,40 +806,136 @@ class LLMProcessor:
             logger.warning(f"LLM extraction failed with {provider_name}: {e}, falling back to rule-based")
             return self.rule_based_extraction(text)
 
-    def _create_extraction_prompt(self, text: str) -> str:
-        """Create extraction prompt for contact information"""
-        return f"""
-Extract contact information from the following text and return as JSON array.
-Each contact should have these fields: name, designation, company, email, phone, website, address, categories, notes.
+    async def _call_provider(
+        self, provider_config: Dict, prompt: str, max_tokens: int = 1500, system_prompt: str = EXTRACTION_SYSTEM_PROMPT
+    ) -> str:
+        """Send prompt after the extraction rules to the provider and return its raw answer"""
+        if provider_config["type"] == "openai" or provider_config["type"] == "openai_compatible":
+            return await self._extract_with_openai_api(provider_config, prompt, max_tokens, system_prompt)
+        elif provider_config["type"] == "anthropic":
+            return await self._extract_with_anthropic(provider_config, prompt, max_tokens, system_prompt)
+        elif provider_config["type"] == "gemini":
+            return await self._extract_with_gemini(provider_config, prompt, system_prompt)
+        else:
+            raise ValueError(f"Unknown provider type: {provider_config['type']}")
+
+    def _create_batch_extraction_prompt(self, texts: List[str]) -> str:
+        """Create one prompt covering several OCR texts, answered per document number"""
+        documents = "\n\n".join(f"### DOC {n}\n{text}" for n, text in enumerate(texts, start=1))
+        return BATCH_EXTRACTION_PROMPT_TEMPLATE.format(count=len(texts), documents=documents)
+
+    async def _extract_batch(self, texts: List[str]) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Extract contacts for several texts with one default-provider request;
+        entries the answer does not cover are None
+        """
+        provider_config = self.providers[self.default_provider]
+        prompt = self._create_batch_extraction_prompt(texts)
+        result = await self._call_provider(
+            provider_config, prompt,
+            max_tokens=min(LLM_BATCH_TOKENS_PER_DOCUMENT * len(texts), LLM_BATCH_MAX_TOKENS),
+            system_prompt=BATCH_EXTRACTION_SYSTEM_PROMPT
+        )
+        try:
+            answers = json_loads(result)
+        except json.JSONDecodeError:
+            logger.warning(f"Batched LLM response is not valid JSON: {repr(result)[:200]}")
+            return [None] * len(texts)
+        if not isinstance(answers, dict):
+            return [None] * len(texts)
+
+        contacts_per_text = []
+        for n, text in enumerate(texts, start=1):
+            contacts = answers.get(str(n))
+            if isinstance(contacts, list):
+                await set_cached_contacts(llm_cache_key(text, self.default_provider, provider_config["model"]), contacts)
+                contacts_per_text.append(contacts)
+            else:
+                contacts_per_text.append(None)
+        return contacts_per_text
+
+    async def _run_batches(self):
+        """Collect queued texts for up to LLM_BATCH_WAIT_SECONDS and extract each batch in one request"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._batch_queue.get()]
+            deadline = loop.time() + LLM_BATCH_WAIT_SECONDS
+            while len(batch) < LLM_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._batch_queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
 
-Categories should be one or more of: Government, Embassy, Consulate, High Commissioner, Deputy High Commissioner,
-Associations, Exporter, Importer, Logistics, Event management, Consultancy, Manufacturer, Distributors, Producers, Others.
+            # A lone text gains nothing from the batch prompt, so its caller makes the usual request
+            if len(batch) == 1:
+                _, future = batch[0]
+                if not future.done():
+                    future.set_result(None)
+                continue
 
-Rules:
-1. Return only valid JSON array, no other text
-2. If no clear contacts found, return empty array []
-3. Ensure all fields are strings (use empty string "" if not found)
-4. Categories should be array of strings
-5. Clean and format phone numbers consistently
-6. Validate email addresses
-7. Notes should be SHORT (max 80 chars) with only key info: qualifications, years experience, or main specialization
+            texts = [text for text, _ in batch]
+            try:
+                results = await self._extract_batch(texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            logger.info(f"Batched LLM extraction covered {sum(r is not None for r in results)}/{len(batch)} texts in one request")
+            for (_, future), contacts in zip(batch, results):
+                if not future.done():
+                    future.set_result(contacts)
+
+    async def extract_contacts_batched(self, text: str, timeout: int = 60) -> List[Dict[str, Any]]:
+        """
+        Extract contacts with the default provider in one request alongside other queued texts,
+        falling back to extract_contacts for anything the batch does not answer
+        """
+        if not self.providers:
+            return self.rule_based_extraction(text)
 
-Example with concise notes:
-[{{"name":"John Doe","designation":"Manager","company":"ABC Corp","email":"john@abc.com","phone":"+1234567890","website":"","address":"123 Main St","categories":["Others"],"notes":"MBA, 10+ years exp, speaks Spanish"}}]
+        provider_config = self.providers[self.default_provider]
+        cached = await get_cached_contacts(llm_cache_key(text, self.default_provider, provider_config["model"]))
+        if cached is not None:
+            logger.info(f"LLM ({self.default_provider}) cache hit: {len(cached)} contacts")
+            return cached
 
-Text to process:
-{text}
+        if self._batch_worker is None or self._batch_worker.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker = asyncio.create_task(self._run_batches())
 
-JSON Response:"""
+        try:
+            future = asyncio.get_running_loop().create_future()
+            await self._batch_queue.put((text, future))
+            contacts = await asyncio.wait_for(future, timeout=max(5, timeout // 2))
+            if contacts is not None:
+                return contacts
+        except asyncio.TimeoutError:
+            logger.warning("Batched LLM extraction timed out")
+        except Exception as e:
+            logger.warning(f"Batched LLM extraction failed: {e}")
+
+        return await self.extract_contacts(text)
 
-    async def _extract_with_openai_api(self, provider_config: Dict, prompt: str) -> str:
+    def _create_extraction_prompt(self, text: str) -> str:
+        """Create the per-request part of the extraction prompt; the rules are in EXTRACTION_SYSTEM_PROMPT"""
+        return EXTRACTION_PROMPT_TEMPLATE.format(text=text)
+
+    async def _extract_with_openai_api(
+        self, provider_config: Dict, prompt: str, max_tokens: int = 1500, system_prompt: str = EXTRACTION_SYSTEM_PROMPT
+    ) -> str:
         """Extract using OpenAI API or compatible"""
         try:
-            response = await asyncio.to_thread(
-                provider_config["client"].chat.completions.create,
+            response = await provider_config["client"].chat.completions.create(
                 model=provider_config["model"],
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1500,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
                 temperature=0.1
             )
 
@@ -380,47 +956,54 @@ JSON Response:"""
             if not content or not content.strip():
                 logger.error("LLM returned empty content")
                 # Return a basic JSON structure instead of failing
-                return '[{"name":"","designation":"","company":"","email":"","phone":"","website":"","address":"","categories":["Others"]}]'
+                return EMPTY_CONTACT_JSON
 
             return content.strip()
 
         except Exception as e:
             logger.error(f"LLM API call failed: {e}")
             # Return a basic JSON structure for fallback
-            return '[{"name":"","designation":"","company":"","email":"","phone":"","website":"","address":"","categories":["Others"]}]'
+            return EMPTY_CONTACT_JSON
 
-    async def _extract_with_anthropic(self, provider_config: Dict, prompt: str) -> str:
+    async def _extract_with_anthropic(
+        self, provider_config: Dict, prompt: str, max_tokens: int = 1500, system_prompt: str = EXTRACTION_SYSTEM_PROMPT
+    ) -> str:
         """Extract using Anthropic Claude"""
-        response = await asyncio.to_thread(
-            provider_config["client"].messages.create,
+        response = await provider_config["client"].messages.create(
             model=provider_config["model"],
-            max_tokens=1500,
+            max_tokens=max_tokens,
+            system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
             messages=[{"role": "user", "content": prompt}]
         )
         return response.content[0].text.strip()
 
-    async def _extract_with_gemini(self, provider_config: Dict, prompt: str) -> str:
+    async def _extract_with_gemini(
+        self, provider_config: Dict, prompt: str, system_prompt: str = EXTRACTION_SYSTEM_PROMPT
+    ) -> str:
         """Extract using Google Gemini"""
-        response = await asyncio.to_thread(
-            provider_config["client"].generate_content,
-            prompt
+        response = await provider_config["client"].generate_content_async(
+            [system_prompt, prompt]
         )
         return response.text.strip()
     
     def rule_based_extraction(self, text: str) -> List[Dict[str, Any]]:
         """Fallback rule-based contact extraction"""
-        import re
-        
-        # Basic patterns
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'[\+]?[1-9]?[\d\s\-\(\)]{8,15}'
-        
-        emails = re.findall(email_pattern, text, re.IGNORECASE)
-        phones = re.findall(phone_pattern, text)
+        emails = EMAIL_RE.findall(text)
+        phones = PHONE_RE.findall(text)
         
         # Simple extraction - one contact per email found
         contacts = []
         lines = text.split('\n')
+
+        # One pass over the lines: where each email first appears, and which lines could be a name
+        line_of_email = {}
+        for i, line in enumerate(lines):
+            for match in EMAIL_RE.finditer(line):
+                line_of_email.setdefault(match.group(), i)
+        is_name_line = [
+            bool(line.strip()) and '@' not in line and '.com' not in line.lower()
+            for line in lines
+        ]
         
         for email in emails:
             contact = {
@@ -435,15 +1018,13 @@ JSON Response:"""
                 "notes": ""
             }
 
-            # Try to find name and company near email
-            for i, line in enumerate(lines):
-                if email in line:
-                    # Look for name in previous lines
-                    for j in range(max(0, i-3), i):
-                        if lines[j].strip() and not any(char in lines[j] for char in '@.com'):
-                            contact["name"] = lines[j].strip()
-                            break
-                    break
+            # Look for name in the lines just above the email
+            i = line_of_email.get(email)
+            if i is not None:
+                for j in range(max(0, i-3), i):
+                    if is_name_line[j]:
+                        contact["name"] = lines[j].strip()
+                        break
 
             # Generate notes from remaining text
             contact["notes"] = self._generate_notes_from_text(text, contact)
@@ -488,8 +1069,7 @@ JSON Response:"""
                 elif 'certified' in line_lower and len(line_clean) < 30:
                     notes.append("Certified")
                 elif any(keyword in line_lower for keyword in ['years experience', 'experience']):
-                    import re
-                    years_match = re.search(r'(\d+)\+?\s*years?', line_lower)
+                    years_match = YEARS_RE.search(line_lower)
                     if years_match:
                         notes.append(f"{years_match.group(1)}+ years")
                 elif any(keyword in line_lower for keyword in ['specializes', 'expert']):
@@ -538,10 +1118,11 @@ except Exception as e:
         async def extract_contacts(self, text: str, provider: str = None) -> List[Dict[str, Any]]:
             return self.rule_based_extraction(text)
 
+        async def extract_contacts_batched(self, text: str, timeout: int = 60) -> List[Dict[str, Any]]:
+            return self.rule_based_extraction(text)
+
         def rule_based_extraction(self, text: str) -> List[Dict[str, Any]]:
-            import re
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, text, re.IGNORECASE)
+            emails = EMAIL_RE.findall(text)
             return [{"name": "", "designation": "", "company": "", "email": email,
                     "phone": "", "website": "", "address": "", "categories": ["Others"]}
                    for email in emails] if emails else [{"name": "", "designation": "",
@@ -575,7 +1156,8 @@ async def health_check():
         "llm_available": len(llm_processor.providers) > 0,
         "llm_providers": list(llm_processor.providers.keys()),
         "default_provider": llm_processor.default_provider,
-        "job_queue_size": len(job_storage)
+        "job_store": "redis" if redis_client is not None else "memory",
+        "job_queue_size": len(job_storage) if redis_client is None else None
     }
 
 @app.post("/process-sync")
@@ -598,11 +1180,19 @@ async def process_image_sync(file: UploadFile = File(...)):
                 detail=f"File too large ({file_size_mb:.1f}MB) for sync processing. Use async endpoint."
             )
 
-        # Process with OCR
-        ocr_result = await ocr_processor.process_image(content, timeout=15)
+        # Process with OCR, reusing the result for an identical image when OCR_RESULT_CACHE is on
+        timeout = 15
+        cache_key = ocr_cache_key(content, ocr_processor.strategies, timeout) if OCR_RESULT_CACHE else None
+        ocr_result = await get_cached(ocr_cache, cache_key) if cache_key else None
+        if ocr_result is not None:
+            logger.info(f"OCR cache hit for {file.filename}")
+        else:
+            ocr_result = await ocr_processor.process_image(content, timeout=timeout)
+            if cache_key and ocr_result["success"]:
+                await set_cached(ocr_cache, OCR_CACHE_SIZE, cache_key, ocr_result)
 
         if not ocr_result["success"]:
-            return JSONResponse(
+            return ResponseClass(
                 status_code=422,
                 content={
                     "success": False,
@@ -636,19 +1226,24 @@ async def process_image_async(background_tasks: BackgroundTasks, file: UploadFil
     job_id = str(uuid.uuid4())
 
     # Store job info
-    job_storage[job_id] = {
+    await set_job(job_id, {
         "status": "queued",
         "filename": file.filename,
         "created_at": datetime.utcnow().isoformat(),
         "result": None,
         "error": None
-    }
+    })
 
-    # Read file content
-    content = await file.read()
-
-    # Add background task
-    background_tasks.add_task(process_image_background, job_id, content, file.filename)
+    if USE_JOB_QUEUE:
+        content = await file.read()
+        ocr_task.send(job_id, base64.b64encode(content).decode(), file.filename)
+    else:
+        # Spool the upload to disk in chunks so queued jobs hold a path rather than the image
+        upload = tempfile.NamedTemporaryFile(delete=False, prefix="ocr-upload-", suffix=os.path.splitext(file.filename)[1])
+        with upload:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                upload.write(chunk)
+        background_tasks.add_task(process_upload_background, job_id, upload.name, file.filename)
 
     return {
         "job_id": job_id,
@@ -659,44 +1254,71 @@ async def process_image_async(background_tasks: BackgroundTasks, file: UploadFil
 @app.get("/status/{job_id}")
 async def get_job_status(job_id: str):
     """Get processing job status"""
-    if job_id not in job_storage:
+    job = await get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    return job_storage[job_id]
+    return job
 
 async def process_image_background(job_id: str, content: bytes, filename: str):
     """Background task for image processing"""
     try:
         # Update status
-        job_storage[job_id]["status"] = "processing"
-        job_storage[job_id]["started_at"] = datetime.utcnow().isoformat()
+        await update_job(job_id, status="processing", started_at=datetime.utcnow().isoformat())
 
-        # Process with OCR (longer timeout for async)
-        ocr_result = await ocr_processor.process_image(content, timeout=60)
+        # Process with OCR (longer timeout for async), sharing tesseract runs with other queued jobs
+        ocr_result = await ocr_processor.process_image_batched(content, timeout=60)
 
         if not ocr_result["success"]:
-            job_storage[job_id]["status"] = "failed"
-            job_storage[job_id]["error"] = ocr_result["error"]
-            job_storage[job_id]["completed_at"] = datetime.utcnow().isoformat()
+            await update_job(
+                job_id,
+                status="failed",
+                error=ocr_result["error"],
+                completed_at=datetime.utcnow().isoformat()
+            )
             return
 
-        # Extract contacts using LLM
-        contacts = await llm_processor.extract_contacts(ocr_result["text"])
+        # Extract contacts using LLM, in one request with other jobs that reach this point together
+        contacts = await llm_processor.extract_contacts_batched(ocr_result["text"])
 
         # Store result
-        job_storage[job_id]["status"] = "completed"
-        job_storage[job_id]["result"] = {
-            "filename": filename,
-            "ocr_result": ocr_result,
-            "contacts": contacts
-        }
-        job_storage[job_id]["completed_at"] = datetime.utcnow().isoformat()
+        await update_job(
+            job_id,
+            status="completed",
+            result={
+                "filename": filename,
+                "ocr_result": ocr_result,
+                "contacts": contacts
+            },
+            completed_at=datetime.utcnow().isoformat()
+        )
 
     except Exception as e:
         logger.error(f"Background processing failed for job {job_id}: {e}")
-        job_storage[job_id]["status"] = "failed"
-        job_storage[job_id]["error"] = str(e)
-        job_storage[job_id]["completed_at"] = datetime.utcnow().isoformat()
+        await update_job(
+            job_id,
+            status="failed",
+            error=str(e),
+            completed_at=datetime.utcnow().isoformat()
+        )
+
+async def process_upload_background(job_id: str, path: str, filename: str):
+    """Background task for an upload spooled to path, which is removed afterwards"""
+    try:
+        content = await asyncio.to_thread(_read_file, path)
+    except OSError as e:
+        logger.error(f"Reading upload failed for job {job_id}: {e}")
+        await update_job(job_id, status="failed", error=str(e), completed_at=datetime.utcnow().isoformat())
+        return
+    finally:
+        os.unlink(path)
+    await process_image_background(job_id, content, filename)
+
+if USE_JOB_QUEUE:
+    @dramatiq.actor(max_retries=2, time_limit=90_000)
+    async def ocr_task(job_id: str, content_b64: str, filename: str):
+        """Worker-side entry point for queued /process-async jobs"""
+        await process_image_background(job_id, base64.b64decode(content_b64), filename)
 
 if __name__ == "__main__":
     import uvicorn
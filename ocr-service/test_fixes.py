@@ -3,8 +3,20 @@
 Test script to verify OCR service fixes
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
 
+def make_session():
+    """Keep-alive session that retries the health checks on gateway errors"""
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+SESSION = make_session()
+
 def test_health_endpoints(base_url):
     """Test health endpoints to verify fixes"""
     print(f"🔍 Testing health endpoints on {base_url}")
@@ -12,7 +24,7 @@ def test_health_endpoints(base_url):
     try:
         # Test root endpoint (this was failing before)
         print("Testing root endpoint...")
-        response = requests.get(f"{base_url}/", timeout=10)
+        response = SESSION.get(f"{base_url}/", timeout=10)
         print(f"✅ Root endpoint: {response.status_code}")
         
         if response.status_code == 200:
@@ -28,7 +40,7 @@ def test_health_endpoints(base_url):
         
         # Test health endpoint
         print("\nTesting health endpoint...")
-        response = requests.get(f"{base_url}/health", timeout=10)
+        response = SESSION.get(f"{base_url}/health", timeout=10)
         print(f"✅ Health endpoint: {response.status_code}")
         
         if response.status_code == 200:
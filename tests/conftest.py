@@ -0,0 +1,35 @@
+"""
+Fixtures shared by the end-to-end tests, built once per test process
+
+Run the suite with: python -m pytest tests/
+With pytest-xdist installed, add -n auto to spread the tests over CPU cores
+"""
+import pytest
+from testlib import API_BASE, OCR_BASE_URL, bind_api, make_session
+
+@pytest.fixture(scope="session")
+def session():
+    """The pooled HTTP session every test shares"""
+    session = make_session()
+    yield session
+    session.close()
+
+@pytest.fixture(scope="session")
+def api_base():
+    """Base URL of the backend API"""
+    return API_BASE
+
+@pytest.fixture(scope="session")
+def ocr_base_url():
+    """Base URL of the OCR microservice"""
+    return OCR_BASE_URL
+
+@pytest.fixture(scope="session")
+def api(session, api_base):
+    """Send api(method, path, ...) to the backend API"""
+    return bind_api(session, api_base)
+
+@pytest.fixture(scope="session")
+def ocr_api(session, ocr_base_url):
+    """Send ocr_api(method, path, ...) to the OCR microservice"""
+    return bind_api(session, ocr_base_url)
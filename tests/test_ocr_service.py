@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Tests for the OCR Microservice
+
+Run with: python -m pytest tests/test_ocr_service.py
+Set OCR_BASE_URL to test a deployment, e.g. OCR_BASE_URL=https://your-ocr-service.onrender.com
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+import io
+import functools
+import pytest
+import struct
+import zlib
+from pathlib import Path
+
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+try:
+    import h2  # noqa: F401 - httpx needs it for http2=True
+    import httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from testlib import json_body, load_fixture
+
+# Plain messages on stdout; LOG_LEVEL=DEBUG adds each async status poll, WARNING keeps only failures
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(message)s", stream=sys.stdout)
+log = logging.getLogger("ocrtests")
+
+# The rendered test card, committed so test runs need no Pillow. After changing
+# render_business_card(), delete it, run the tests once with Pillow installed and
+# commit the new file
+CARD_FIXTURE = Path(__file__).with_name("fixtures") / "business_card.png"
+
+def render_business_card():
+    """Draw the test business card with Pillow and return it as PNG bytes"""
+    from PIL import Image, ImageDraw, ImageFont
+    
+    # Try to use a font, fallback to default
+    try:
+        font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
+        font_medium = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18)
+        font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
+    except OSError:
+        font_large = font_medium = font_small = ImageFont.load_default()
+    
+    # Create image
+    img = Image.new('RGB', (600, 400), color='white')
+    draw = ImageDraw.Draw(img)
+    
+    # Draw business card content
+    draw.text((50, 50), "John Doe", fill='black', font=font_large)
+    draw.text((50, 90), "Senior Software Engineer", fill='black', font=font_medium)
+    draw.text((50, 130), "Tech Solutions Inc.", fill='black', font=font_medium)
+    draw.text((50, 180), "john.doe@techsolutions.com", fill='blue', font=font_small)
+    draw.text((50, 210), "+1-555-123-4567", fill='black', font=font_small)
+    draw.text((50, 240), "www.techsolutions.com", fill='blue', font=font_small)
+    draw.text((50, 280), "123 Tech Street", fill='black', font=font_small)
+    draw.text((50, 300), "Silicon Valley, CA 94000", fill='black', font=font_small)
+    
+    # Add a border
+    draw.rectangle([(10, 10), (590, 390)], outline='black', width=2)
+    
+    # Save to bytes
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, format='PNG')
+    img_bytes.seek(0)
+    
+    return img_bytes.getvalue()
+
+@pytest.fixture(scope="session")
+def card_png():
+    """The test business card PNG, rendered into CARD_FIXTURE only if that is missing"""
+    return load_fixture(CARD_FIXTURE, render_business_card)
+
+@functools.lru_cache(maxsize=1)
+def blank_png():
+    """Return a 1x1 white grayscale PNG, built by hand so no imaging library is needed"""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0)  # 1x1, 8-bit grayscale
+    pixels = zlib.compress(b"\x00\xff")  # Filter byte, then one white pixel
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", pixels) + chunk(b"IEND", b"")
+
+@pytest.fixture(scope="session")
+def warm_ocr_api(ocr_api, ocr_base_url):
+    """
+    ocr_api, after a throwaway image has gone through /process-sync once
+    so cold-start work stays out of the timed tests
+    """
+    log.info("\n🔥 Warming up %s", ocr_base_url)
+    start_time = time.time()
+    try:
+        response = post_image(ocr_api, "/process-sync", 'warmup.png', blank_png(), timeout=60)
+        # A blank image has no text, so a 422 here still means the OCR path ran
+        log.info("   Warmup: %s (took %.2fs)", response.status_code, time.time() - start_time)
+    except Exception as e:
+        log.error("❌ Warmup failed: %s", e)
+    return ocr_api
+
+def post_image(ocr_api, path, filename, img_data, timeout):
+    """POST an image to the OCR service as a multipart upload, streaming the body when requests-toolbelt is installed"""
+    if MultipartEncoder is None:
+        files = {'file': (filename, img_data, 'image/png')}
+        return ocr_api("POST", path, files=files, timeout=timeout)
+    
+    encoder = MultipartEncoder(fields={'file': (filename, io.BytesIO(img_data), 'image/png')})
+    return ocr_api(
+        "POST",
+        path,
+        data=encoder,
+        headers={'Content-Type': encoder.content_type},
+        timeout=timeout,
+    )
+
+@pytest.mark.parametrize("path", ["/", "/health"])
+def test_health_check(ocr_api, ocr_base_url, path):
+    """Test health check endpoints"""
+    response = ocr_api("GET", path)
+    log.info("✅ %s%s: %s", ocr_base_url, path, response.status_code)
+    assert response.status_code == 200, response.text
+    
+    if path == "/":
+        data = json_body(response)
+        log.info("   Service: %s", data.get('service'))
+        log.info("   OCR Available: %s", data.get('capabilities', {}).get('ocr_available'))
+        log.info("   LLM Available: %s", data.get('capabilities', {}).get('llm_available'))
+
+def process_sync(ocr_api, ocr_base_url, img_data):
+    """Run img_data through /process-sync and return the contacts found"""
+    response = post_image(ocr_api, "/process-sync", 'business_card.png', img_data, timeout=35)
+    assert response.status_code == 200, response.text
+    
+    data = json_body(response)
+    assert data.get('success'), data
+    
+    ocr_result = data.get('ocr_result', {})
+    log.info("   OCR Strategy: %s", ocr_result.get('strategy_used'))
+    log.info("   Text Length: %d", len(ocr_result.get('text', '')))
+    return data.get('contacts', [])
+
+def poll_delays(max_wait, first=0.1, factor=1.7, cap=2.0):
+    """Yield delays between status polls, short at first and backing off, until max_wait seconds have passed"""
+    deadline = time.monotonic() + max_wait
+    delay = first
+    while time.monotonic() < deadline:
+        yield delay
+        delay = min(delay * factor, cap)
+
+def job_finished(job_status, start_time):
+    """Return whether a polled job has completed, failing the test if the job failed"""
+    status = job_status["status"]
+    log.debug("   Status after %.1fs: %s", time.time() - start_time, status)
+    assert status != "failed", f"Async processing failed: {job_status.get('error')}"
+    return status == "completed"
+
+def run_async_job(ocr_api, img_data, start_time, max_wait):
+    """Upload img_data to /process-async and poll until it finishes; returns the final status, or None on timeout"""
+    response = post_image(ocr_api, "/process-async", 'business_card_large.png', img_data, timeout=15)
+    assert response.status_code == 200, f"Async job creation failed: {response.status_code} - {response.text}"
+    
+    job_id = json_body(response)["job_id"]
+    log.info("✅ Async job started: %s", job_id)
+    
+    for delay in poll_delays(max_wait):
+        time.sleep(delay)
+        status_response = ocr_api("GET", f"/status/{job_id}", timeout=5)
+        if status_response.status_code == 200:
+            job_status = json_body(status_response)
+            if job_finished(job_status, start_time):
+                return job_status
+    return None
+
+async def run_async_job_http2(ocr_base_url, img_data, start_time, max_wait):
+    """run_async_job over a single HTTP/2 connection, so the upload and every poll share one socket"""
+    async with httpx.AsyncClient(
+        base_url=ocr_base_url,
+        http2=True,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=10),
+    ) as client:
+        files = {'file': ('business_card_large.png', img_data, 'image/png')}
+        response = await client.post("/process-async", files=files, timeout=15)
+        assert response.status_code == 200, f"Async job creation failed: {response.status_code} - {response.text}"
+        
+        job_id = json_body(response)["job_id"]
+        log.info("✅ Async job started: %s (%s)", job_id, response.http_version)
+        
+        for delay in poll_delays(max_wait):
+            await asyncio.sleep(delay)
+            status_response = await client.get(f"/status/{job_id}", timeout=5)
+            if status_response.status_code == 200:
+                job_status = json_body(status_response)
+                if job_finished(job_status, start_time):
+                    return job_status
+    return None
+
+def process_async(ocr_api, ocr_base_url, img_data):
+    """Run img_data through /process-async, over HTTP/2 when h2 is installed, and return the contacts found"""
+    max_wait = 30
+    start_time = time.time()
+    if HTTP2_AVAILABLE:
+        job_status = asyncio.run(run_async_job_http2(ocr_base_url, img_data, start_time, max_wait))
+    else:
+        job_status = run_async_job(ocr_api, img_data, start_time, max_wait)
+    assert job_status is not None, f"Async processing timed out after {max_wait}s"
+    return job_status["result"].get("contacts", [])
+
+@pytest.mark.parametrize("process", [process_sync, process_async], ids=["sync", "async"])
+def test_process_card(warm_ocr_api, ocr_base_url, card_png, process):
+    """Test that the business card's contact comes back from each processing endpoint"""
+    log.info("\n📄 Testing %s on %s (%d byte image)", process.__name__, ocr_base_url, len(card_png))
+    
+    start_time = time.time()
+    contacts = process(warm_ocr_api, ocr_base_url, card_png)
+    log.info("✅ Processing completed (took %.1fs)", time.time() - start_time)
+    log.info("   Contacts Found: %d", len(contacts))
+    
+    if contacts:
+        contact = contacts[0]
+        log.info("   First Contact: %s - %s", contact.get('name'), contact.get('email'))
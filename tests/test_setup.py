@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Setup checks for the Contact Management System
+
+Run with: python -m pytest tests/test_setup.py
+"""
+
+import os
+import pytest
+from testlib import json_body
+
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:5173")
+
+TEST_CONTACT = {
+    "name": "Test User",
+    "email": "test@example.com",
+    "phone": "123-456-7890",
+    "address": "123 Test St",
+    "category": "Personal",
+    "notes": "Test contact"
+}
+
+@pytest.mark.parametrize("path", ["/health", "/contacts"], ids=["backend-health", "database"])
+def test_backend_reachable(api, path):
+    """Test that the backend is up and can read from its database"""
+    response = api("GET", path, timeout=5)
+    assert response.status_code == 200, f"GET {path} failed: {response.status_code}"
+
+def test_contact_crud(api):
+    """Create a contact and delete it again"""
+    response = api("POST", "/contacts", json=TEST_CONTACT, timeout=5)
+    assert response.status_code == 200, f"Contact creation failed: {response.status_code}"
+    contact_id = json_body(response)["id"]
+    
+    response = api("DELETE", f"/contacts/{contact_id}", timeout=5)
+    assert response.status_code == 200, f"Contact deletion failed: {response.status_code}"
+
+def test_frontend(session):
+    """Test if frontend is accessible"""
+    response = session.get(FRONTEND_URL, timeout=5)
+    assert response.status_code == 200, f"Frontend not accessible: {response.status_code}"
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the end-to-end tests; the pytest fixtures built on them are in conftest.py
+"""
+import json
+import os
+import tempfile
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Services under test; point these at a deployment to test it instead of the local stack
+API_BASE = os.environ.get("API_BASE_URL", "http://localhost:8000")
+OCR_BASE_URL = os.environ.get("OCR_BASE_URL", "http://localhost:8002")
+
+def make_session():
+    """
+    Return a keep-alive session whose pool is large enough for the concurrent checks;
+    gateway errors (502/503/504) are retried with backoff, honouring Retry-After
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.25,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'POST', 'DELETE']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def bind_api(session, base_url):
+    """Return request(method, path, **kwargs), sending to base_url + path over session with a 10s default timeout"""
+    def request(method, path, timeout=10, **kwargs):
+        return session.request(method, f"{base_url}{path}", timeout=timeout, **kwargs)
+    return request
+
+# Sent with bodies that are already encoded, since data= leaves the Content-Type unset
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def json_dumps(obj):
+    """Encode obj as JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def json_body(response):
+    """Decode a JSON response body, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def load_fixture(path, render):
+    """Return the bytes stored at path, calling render() and saving its result only if the file is missing"""
+    if path.exists():
+        return path.read_bytes()
+    
+    data = render()
+    path.parent.mkdir(exist_ok=True)
+    # Write to a private temp file and rename it into place, so parallel workers
+    # (pytest -n auto) never read a half-written fixture
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp files are private; fixtures are not
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return data